@@ -1,14 +1,31 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import numpy as np
+import os
 from datetime import datetime, date
-
-import plotly.express as px
-import plotly.graph_objects as go
+from html import escape
+
+from cursos import figuras, grilla, perf, pipeline, proyecciones, snapshot
+from cursos.notas import POR_PAGINA as NOTAS_POR_PAGINA, TAGS, Notas
+from cursos.almacen import Almacen, Bitacora, version_de
+from cursos.cambios import aplicar_cambios, indice_ediciones, version_parche
+from cursos.catalogos import PROGRAMAS, REGIONES, CANALES, DISCIP, MONTHS
+from cursos.esquema import aplicar_esquema
+from cursos.exportar import FORMATOS, exportar
+from cursos.generador import seed_data
+from cursos.ingesta import ingerir_frame
 
 # ---------- Config base ----------
 st.set_page_config(page_title="Dashboard de Cursos — AleteIA / TESSENA", layout="wide")
+# Tiempos por etapa de esta recarga (ver panel de diagnóstico al final)
+corrida = perf.iniciar(perfil=st.session_state.pop("_perfilar", False))
+
+def salir(cortar, **extra):
+    # st.stop()/st.rerun() terminan el script aquí: cerrar antes la corrida (apaga cProfile)
+    _, perfil = perf.cerrar(corrida, **extra)
+    if perfil:
+        st.session_state._perfil = perfil
+    cortar()
 
 # ---------- Estilos ----------
 CSS = """
@@ -34,28 +51,14 @@ h1,h2,h3{ letter-spacing:.2px; }
 .small{ color:var(--muted); font-size:.92rem; }
 hr.sep{ height:1px; border:none; margin:14px 0; background:linear-gradient(90deg,var(--primary),transparent); }
 .note-pill{ display:inline-block; padding:6px 10px; border-radius:10px; background:#fffbe6; border:1px solid #fde68a; color:#92400e; }
-.stTabs [role="tab"]{ padding:10px 16px; border-radius:12px; }
-.stTabs [role="tab"][aria-selected="true"]{ background:var(--card); border:1px solid var(--border); }
+[role="radiogroup"] label{ padding:8px 14px; border-radius:12px; border:1px solid transparent; }
+[role="radiogroup"] label:has(input:checked){ background:var(--card); border:1px solid var(--border); }
 .instruction{ background:var(--card); border:1px dashed var(--border); border-radius:12px; padding:10px 12px; color:var(--muted);}
 .chips span{ margin-right:6px; }
 </style>
 """
 st.markdown(CSS, unsafe_allow_html=True)
 
-# ---------- Catálogos ----------
-PROGRAMAS = [
-    ("Data Science", "Curso 6 meses", "MES", 1500, 6, None),
-    ("Análisis de Datos", "Taller 8 semanas", "SEM", 700, None, 8),
-    ("Desarrollo Web No-Code", "Taller 9 semanas", "SEM", 1400, None, 9),
-    ("Excel Básico & Analítica", "Taller 8 semanas", "SEM", 500, None, 8),
-    ("MCP Avanzado (AI+MCP)", "Bootcamp 12 semanas", "SEM", 2500, None, 12),
-    ("Bootcamp IA/Datos (Intensivo)", "Bootcamp 8 meses", "MES", 3000, 8, None),
-]
-REGIONES = ["CDMX (MX)","Monterrey (MX)","Guadalajara (MX)","Tijuana (MX)","Bogotá (CO)","Medellín (CO)","Auckland (NZ)","Madrid (ES)"]
-CANALES  = ["Influencers (micro)","Referidos","Grupos Facebook","LinkedIn"]
-DISCIP   = ["STEM","Derecho","Economía","Sociología","Diseño","Administración","Profesorado"]
-MONTHS   = ["Ene","Feb","Mar","Abr","May","Jun","Jul","Ago","Sep","Oct","Nov","Dic"]
-
 # ---------- Utilidades ----------
 def k_formatter(x):
     if x >= 1_000_000: return f"{x/1_000_000:.2f}M"
@@ -65,101 +68,97 @@ def k_formatter(x):
 def chips(items):
     return " ".join([f"<span class='badge'>{x}</span>" for x in items])
 
-def px_template(theme_choice: str):
-    return "plotly_dark" if theme_choice == "Oscuro" else "plotly_white"
-
-PALETTE = ["#1e88e5","#43a047","#fb8c00","#8e24aa","#00acc1","#ef5350","#3949ab","#00897b"]
-
-def calc_ingresos(row):
-    if row.UnidadPrecio == "MES":
-        meses = int(row.DuraciónMeses if pd.notna(row.DuraciónMeses) else 6)
-        return row.PrecioUnidadMXN * meses * row.Estudiantes
-    else:
-        sem = int(row.DuraciónSemanas if pd.notna(row.DuraciónSemanas) else 8)
-        return row.PrecioUnidadMXN * sem * row.Estudiantes
-
-# ---------- Datos de ejemplo (más realistas, 2022 reducido) ----------
-def seed_data():
-    np.random.seed(42)
-
-    starts = {
-        "Data Science": [1, 7],                # Feb, Ago
-        "Análisis de Datos": [2, 8],           # Mar, Sep
-        "Desarrollo Web No-Code": [3, 9],      # Abr, Oct
-        "Excel Básico & Analítica": [0, 6, 9], # Ene, Jul, Oct
-        "MCP Avanzado (AI+MCP)": [4, 8],       # May, Sep
-        "Bootcamp IA/Datos (Intensivo)": [0, 6]# Ene, Jul
-    }
-    ranges = {
-        "Data Science": (12, 28),
-        "Análisis de Datos": (15, 40),
-        "Desarrollo Web No-Code": (10, 28),
-        "Excel Básico & Analítica": (12, 38),
-        "MCP Avanzado (AI+MCP)": (8, 22),
-        "Bootcamp IA/Datos (Intensivo)": (8, 18),
-    }
-    years = [2022, 2023, 2024, 2025]
-    year_scale = {2022: 0.55, 2023: 0.85, 2024: 1.0, 2025: 1.0}  # 🔻 baja 2022
-
-    rows = []
-    prog_map = {p[0]: p for p in PROGRAMAS}
-
-    for y in years:
-        offered_size = np.random.randint(1, 3) if y == 2022 else np.random.randint(1, 5)
-        offered = np.random.choice([p[0] for p in PROGRAMAS], size=offered_size, replace=False)
-        for prog in offered:
-            P = prog_map[prog]
-            starts_for_prog = starts[prog]
-            n_ed = 1 if y == 2022 else (1 if np.random.rand() < 0.7 else 2)
-            chosen_months = np.random.choice(starts_for_prog, size=n_ed, replace=False)
-            for m in chosen_months:
-                est_min, est_max = ranges[prog]
-                raw = np.random.randint(est_min, est_max + 1)
-                n_est = max(5, int(raw * year_scale.get(y, 1.0)))  # escala por año
-
-                # Mezcla de pagos ~40/20/30/10
-                p = np.random.dirichlet([8, 4, 6, 2])
-                pct_deb, pct_cre, pct_tra, pct_pay = np.round(p * 100).astype(int)
-                pct_deb += (100 - (pct_deb + pct_cre + pct_tra + pct_pay))  # ajuste suma=100
-
-                colocados = int(np.random.randint(0, max(1, int(n_est * 0.55))))  # hasta ~55%
-
-                rows.append([
-                    date(y, m+1, 1), y, m+1, MONTHS[m],
-                    *P, n_est,
-                    np.random.choice(CANALES, p=[0.6,0.18,0.12,0.10]),
-                    np.random.choice(REGIONES, p=[.55,.09,.07,.05,.09,.05,.03,.07]),
-                    np.random.choice(DISCIP, p=[.52,.08,.11,.07,.07,.10,.05]),
-                    f"{prog[:3].upper()}-{y}-{m+1}",
-                    int(pct_deb), int(pct_cre), int(pct_tra), int(pct_pay),
-                    colocados
-                ])
-
-    cols = ["FechaInicio","Año","MesNum","Mes","Programa","Modalidad","UnidadPrecio","PrecioUnidadMXN",
-            "DuraciónMeses","DuraciónSemanas","Estudiantes","CanalDominante","Region","Disciplina","Edición",
-            "PctDebito","PctCredito","PctTransfer","PctPayPal","Colocados"]
-    df = pd.DataFrame(rows, columns=cols)
-
-    # Consistencia
-    df[["PctDebito","PctCredito","PctTransfer","PctPayPal"]] = df[["PctDebito","PctCredito","PctTransfer","PctPayPal"]].clip(0,100)
-    df["Colocados"] = df[["Colocados","Estudiantes"]].min(axis=1)
-    return df
+def descargas(fuente, etiqueta, nombre, key):
+    # Un botón por formato; ``fuente()`` y el archivo se arman por lotes solo al hacer clic
+    cols = st.columns(len(FORMATOS))
+    for col, (fmt, (txt, mime, ext)) in zip(cols, FORMATOS.items()):
+        col.download_button(f"{etiqueta} · {txt}", data=lambda fmt=fmt: exportar(fuente(), fmt), file_name=nombre + ext,
+                            mime=mime, key=f"{key}_{fmt}", use_container_width=True)
 
 # ---------- Estado ----------
-if "df" not in st.session_state:
-    st.session_state.df = seed_data()
-if "notes" not in st.session_state:
-    st.session_state.notes = []
-
-df = st.session_state.df
+@st.cache_resource(show_spinner=False)
+def almacen():
+    # Una sola base por proceso (Parquet local), compartida por todas las sesiones.
+    # Sin archivo se copia la base prearmada (almacen.SEMILLA); seed_data solo si falta también.
+    return Almacen(sembrar=seed_data)
+
+def base_actual():
+    # Cambios locales de la sesión si los hay; si no, la base compartida (sin copia)
+    if "df" in st.session_state:
+        return st.session_state.df, st.session_state.df_version
+    return almacen().leer()
+
+def set_df(base, origen):
+    # Todo cambio a la base pasa por aquí: tipos compactos + invalidar la caché de derivados.
+    # Queda como capa local de la sesión hasta publicarlo (copy-on-write); ``origen`` es la
+    # versión compartida de la que parte la capa, para no pisar lo que otra sesión publique.
+    st.session_state.setdefault("df_origen", origen)
+    base = aplicar_esquema(base)
+    st.session_state.df = base
+    st.session_state.df_version = version_de(base)
+
+def bitacora():
+    # Altas de "Agregar edición" pendientes de compactar sobre la base de la sesión
+    if "bitacora" not in st.session_state:
+        st.session_state.bitacora = Bitacora()
+    return st.session_state.bitacora
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def claves_de(version, _base):
+    return frozenset(_base["Edición"])
+
+def compactar():
+    # Vuelca la bitácora sobre la base (una sola concatenación por lote)
+    nuevas = bitacora()
+    if len(nuevas):
+        base, version = base_actual()
+        set_df(pd.concat([base, nuevas.frame()], ignore_index=True), version)
+        nuevas.limpiar()
+
+def parchar_df(cambios):
+    # Cambios puntuales del editor: se aplican en sitio sobre la capa local,
+    # sin re-copiar ni re-hashear la base completa
+    compactar()
+    base, version = base_actual()
+    if "df" not in st.session_state:
+        base = base.copy()  # primera edición: copia privada de la base compartida
+        st.session_state.df_origen = version
+    if st.session_state.get("_indice_src") is not base:
+        st.session_state._indice_src = base
+        st.session_state._indice = indice_ediciones(base)
+    aplicar_cambios(base, cambios, st.session_state._indice)
+    st.session_state.df = base
+    st.session_state.df_version = version_parche(version, cambios)
+
+def descartar_local():
+    for k in ("df", "df_version", "df_origen"):
+        st.session_state.pop(k, None)
+    bitacora().limpiar()
+
+@st.cache_resource(show_spinner=False)
+def notas():
+    # Notas del equipo en SQLite local, compartidas por todas las sesiones
+    return Notas()
+
+df, df_version = base_actual()
+nuevas = bitacora()
 
 # ---------- Sidebar ----------
 with st.sidebar:
     st.markdown("### 🎛️ Filtros")
-    year = st.selectbox("Año", sorted(df["Año"].unique()), index=len(sorted(df["Año"].unique()))-1)
-    progs = st.multiselect("Programa", sorted(df["Programa"].unique()), default=sorted(df["Programa"].unique()))
+    anios_disp = [int(a) for a in sorted(df["Año"].unique())]
+    if st.toggle("Rango de años", value=False, key="rango"):
+        a0, a1 = st.select_slider("Años", anios_disp, value=(anios_disp[0], anios_disp[-1]))
+        anios = [a for a in anios_disp if a0 <= a <= a1]
+    else:
+        anios = [st.selectbox("Año", anios_disp, index=len(anios_disp)-1)]
+    year = anios[-1]
+    periodo = str(year) if len(anios) == 1 else f"{anios[0]}–{anios[-1]}"
+    prog_opts = sorted(set(df["Programa"].dropna()) | set(nuevas.frame()["Programa"].dropna()))
+    progs = st.multiselect("Programa", prog_opts, default=prog_opts)
     canales = st.multiselect("Canal", CANALES, default=CANALES)
     regiones = st.multiselect("Región", REGIONES, default=REGIONES)
+    discs = st.multiselect("Disciplina", DISCIP, default=DISCIP)
     st.markdown("<hr/>", unsafe_allow_html=True)
 
     col_a, col_b = st.columns(2)
@@ -193,8 +192,53 @@ with st.sidebar:
                     "PctDebito": 40, "PctCredito": 20, "PctTransfer": 30, "PctPayPal": 10,
                     "Colocados": 0
                 }
-                st.session_state.df = pd.concat([st.session_state.df, pd.DataFrame([new_row])], ignore_index=True)
-                st.toast("Edición agregada ✅")
+                try:
+                    nuevas.agregar(new_row, claves_base=claves_de(df_version, df))
+                except ValueError:
+                    st.error(f"Ya existe la edición {new_row['Edición']} ({prog_new}, {mes_new} {y_new}).")
+                else:
+                    if nuevas.lleno():
+                        compactar()
+                    st.toast("Edición agregada ✅")
+
+        # Importación masiva (CSV/Parquet), validada por lotes
+        with st.expander("📥 Importar ediciones (CSV/Parquet)"):
+            archivo = st.file_uploader("Archivo de ediciones", type=["csv","parquet"], key="imp_file")
+            reemplazar = st.toggle("Reemplazar la base (si no, se agregan)", value=False, key="imp_replace")
+            if archivo is not None and st.button("Importar", use_container_width=True):
+                compactar()
+                base, version = base_actual()
+                with st.spinner("Importando…"):
+                    importadas, reporte = ingerir_frame(archivo, claves=None if reemplazar else claves_de(version, base))
+                if reporte.validas:
+                    set_df(importadas if reemplazar else pd.concat([base, importadas], ignore_index=True), version)
+                resumen = (f"{reporte.validas:,} ediciones importadas · {reporte.rechazadas:,} rechazadas · "
+                           f"{reporte.filas_por_seg:,.0f} filas/s")
+                if reporte.validas:
+                    st.success(resumen)
+                else:
+                    st.error(resumen)
+                for motivo, n in reporte.motivos.items():
+                    st.caption(f"{motivo}: {n:,}")
+
+        # Cambios locales -> base compartida
+        if "df" in st.session_state or len(nuevas):
+            st.caption("Tienes cambios locales sin publicar en la base compartida.")
+            p1, p2 = st.columns(2)
+            if p1.button("Publicar", type="primary", use_container_width=True):
+                compactar()
+                try:
+                    almacen().guardar(st.session_state.df, origen=st.session_state.get("df_origen"))
+                except ValueError as e:
+                    st.error(f"{e}: otra sesión publicó cambios. Descarta los tuyos y vuelve a aplicarlos "
+                             "sobre la versión actual.")
+                else:
+                    descartar_local()
+                    st.toast("Base compartida actualizada ✅")
+                    salir(st.rerun, accion="publicar")
+            if p2.button("Descartar", use_container_width=True):
+                descartar_local()
+                salir(st.rerun, accion="descartar")
 
 # ---------- Encabezado ----------
 st.markdown(
@@ -202,142 +246,168 @@ st.markdown(
     f"<b>Programas de formación · 2022–2025</b> "
     f"{'&nbsp;&nbsp;<span class=\"badge\">Versión para presentación</span>' if modo_externo else ''}"
     f"<br><span class='small'>Última actualización: {datetime.now().strftime('%Y-%m-%d %H:%M')} · "
-    f"Filtros activos:</span><div class='chips small'>{chips([str(year)])} {chips(progs[:3]+(['…'] if len(progs)>3 else []))} "
+    f"Filtros activos:</span><div class='chips small'>{chips([periodo])} {chips(progs[:3]+(['…'] if len(progs)>3 else []))} "
     f"{chips(canales[:2]+(['…'] if len(canales)>2 else []))}</div></div>",
     unsafe_allow_html=True
 )
 
+# ---------- Derivados (robustos a NaN/strings) ----------
+# Cachés compartidas entre sesiones (LRU acotado). La llave es la versión de
+# datos + filtros; los argumentos con "_" no se hashean. Los resultados se
+# comparten por referencia: tratarlos como solo lectura.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def base_derivada(version, _base):
+    return pipeline.preparar(_base)
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def seleccionar(version, anios, progs, canales, regiones, discs, _base):
+    # Solo posiciones (int32) + rebanada del cubo: una entrada pesa 4 bytes por fila
+    # elegida, no una copia de las filas; las filas se toman al pedirlas
+    return pipeline.seleccionar(base_derivada(version, _base), anios, progs, canales, regiones, discs)
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def snapshot_de(version, filtros, marca):
+    # ``marca`` (mtime del manifiesto) invalida al regenerar los snapshots
+    return snapshot.cargar(version, filtros)
+
+def marca_snapshots():
+    try:
+        return os.stat(snapshot.SNAP_DEFAULT / "manifest.json").st_mtime_ns
+    except OSError:
+        return None
+
 # ---------- Filtros ----------
-f = df[(df["Año"]==year) & (df["Programa"].isin(progs)) & (df["CanalDominante"].isin(canales)) & (df["Region"].isin(regiones))].copy()
-if f.empty:
+filtros = (tuple(anios), tuple(sorted(progs)), tuple(sorted(canales)), tuple(sorted(regiones)), tuple(sorted(discs)))
+_fq = []
+
+def datos():
+    # (f, q) de los filtros actuales. Con snapshot solo se calcula si una pestaña lo pide.
+    if not _fq:
+        with perf.etapa("datos"):
+            pos, q = seleccionar(df_version, *filtros, df)
+            f = base_derivada(df_version, df).tomar(pos)
+        if len(nuevas):
+            # Altas pendientes: se derivan aparte (son pocas) y se suman como celdas extra del cubo
+            f, q = pipeline.sumar_delta(f, q, nuevas.frame(), *filtros)
+        _fq.append((f, q))
+    return _fq[0]
+
+# Modo externo sin cambios locales: KPIs y figuras desde el snapshot precalculado si lo hay
+marca = marca_snapshots() if modo_externo and not len(nuevas) else None
+snap = snapshot_de(df_version, filtros, marca) if marca else None
+k = snap["kpis"] if snap else pipeline.kpis(*datos())
+if not k["filas"]:
     st.warning("No hay datos con los filtros actuales. Ajusta opciones en la barra lateral.")
-    st.stop()
+    salir(st.stop, filas=0, version=df_version)
 
-# ---------- Derivados (robustos a NaN/strings) ----------
-def normalize_row_pcts(row):
-    # Lee seguro (vacíos/strings -> 0), limita a [0,100] y normaliza a 100
-    vals = []
-    for c in ["PctDebito","PctCredito","PctTransfer","PctPayPal"]:
-        v = row.get(c, 0)
-        try:
-            v = float(v)
-        except Exception:
-            v = 0.0
-        vals.append(max(0.0, min(100.0, v)))
-
-    p = np.array(vals, dtype=float)
-    s = np.nansum(p)
-
-    # Si todo está vacío/0/NaN, usa 40/20/30/10 por defecto
-    if not np.isfinite(s) or s <= 0:
-        p = np.array([40, 20, 30, 10], dtype=float)
-        s = 100.0
-
-    p = p / s * 100.0
-    r = np.round(p).astype(int)
-    # Ajuste final para que sume 100
-    r[0] += (100 - r.sum())
-    r = np.clip(r, 0, 100)
-    return r
-
-# Tipos seguros básicos
-f["Estudiantes"] = pd.to_numeric(f["Estudiantes"], errors="coerce").fillna(0).astype(int)
-for c in ["PctDebito","PctCredito","PctTransfer","PctPayPal"]:
-    f[c] = pd.to_numeric(f[c], errors="coerce").fillna(0)
-
-# Porcentajes normalizados por fila (N = normalizado)
-pcts = f.apply(normalize_row_pcts, axis=1, result_type="expand")
-pcts.columns = ["PctDebitoN","PctCreditoN","PctTransferN","PctPayPalN"]
-f = pd.concat([f.reset_index(drop=True), pcts], axis=1)
-
-# Ingresos estimados (numérico seguro)
-f["IngresosMXN"] = pd.to_numeric(
-    f.apply(calc_ingresos, axis=1), errors="coerce"
-).replace([np.inf, -np.inf], np.nan).fillna(0.0)
-
-# Estudiantes por método de pago (a prueba de NaN/strings)
-est = pd.to_numeric(f["Estudiantes"], errors="coerce").fillna(0)
-for col, pct_col in [
-    ("Debito","PctDebitoN"),
-    ("Credito","PctCreditoN"),
-    ("Transfer","PctTransferN"),
-    ("PayPal","PctPayPalN")
-]:
-    p = pd.to_numeric(f[pct_col], errors="coerce").fillna(0)
-    f[f"Est_{col}"] = ((est * p / 100.0).round()).astype(int)
+total_est, ingresos_tot, coloc_tot = k["total_est"], k["ingresos_tot"], k["coloc_tot"]
+tasa_coloc, top_prog = k["tasa_coloc"], k["top_prog"]
 
 # ---------- KPIs ----------
-tpl = px_template(theme_graphs)
+tpl = figuras.px_template(theme_graphs)
 c1,c2,c3,c4,c5 = st.columns(5)
 with c1:
-    st.markdown("<div class='box kpi'><div><h4>Estudiantes (año)</h4>"
-                f"<div class='val'>{int(f['Estudiantes'].sum())}</div></div></div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='box kpi'><div><h4>Estudiantes ({periodo})</h4>"
+                f"<div class='val'>{total_est}</div></div></div>", unsafe_allow_html=True)
 with c2:
     st.markdown("<div class='box kpi'><div><h4>Ingresos estimados</h4>"
-                f"<div class='val'>${k_formatter(int(f['IngresosMXN'].sum()))} MXN</div></div></div>", unsafe_allow_html=True)
+                f"<div class='val'>${k_formatter(ingresos_tot)} MXN</div></div></div>", unsafe_allow_html=True)
 with c3:
     st.markdown("<div class='box kpi'><div><h4>Ediciones</h4>"
-                f"<div class='val'>{f['Edición'].nunique()}</div></div></div>", unsafe_allow_html=True)
+                f"<div class='val'>{k['ediciones']}</div></div></div>", unsafe_allow_html=True)
 with c4:
-    top_prog = f.groupby("Programa")["Estudiantes"].sum().sort_values(ascending=False).index[0]
     st.markdown("<div class='box kpi'><div><h4>Programa líder</h4>"
                 f"<div class='val'>{top_prog}</div></div></div>", unsafe_allow_html=True)
 with c5:
-    coloc_tot = int(pd.to_numeric(f["Colocados"], errors="coerce").fillna(0).sum())
-    total_est = int(f["Estudiantes"].sum())
-    tasa_coloc = (coloc_tot / total_est * 100) if total_est > 0 else 0
     st.markdown("<div class='box kpi'><div><h4>Empleabilidad</h4>"
                 f"<div class='val'>{tasa_coloc:.1f}%</div><div class='small'>{coloc_tot} colocados</div></div></div>", unsafe_allow_html=True)
 
 st.markdown("<hr class='sep'/>", unsafe_allow_html=True)
 
+# ---------- Figuras ----------
+# Todo lo anterior (barra lateral, encabezado, KPIs) se pinta sin importar
+# Plotly: figuras lo importa recién al armar el primer gráfico.
+# Caché compartida de figuras terminadas por (versión, filtros, plantilla): una
+# sala de espectadores con los mismos filtros arma cada figura una sola vez.
+# Se comparten por referencia: no mutarlas después de cachear.
+@st.cache_resource(max_entries=512, show_spinner=False)
+def figura_cacheada(nombre, version, filtros, tpl, _snap, _datos):
+    spec = _snap["figuras"].get(tpl, {}).get(nombre) if _snap else None
+    if spec is not None:
+        return snapshot.figura(spec)
+    return figuras.FIGURAS[nombre](_datos()[1], tpl)
+
+def figura(nombre):
+    # Con altas pendientes la rebanada es propia de la sesión: se arma en el momento
+    if len(nuevas):
+        return figuras.FIGURAS[nombre](datos()[1], tpl)
+    return figura_cacheada(nombre, df_version, filtros, tpl, snap, datos)
+
+# ---------- Grilla paginada ----------
+@st.cache_resource(max_entries=32, show_spinner=False)
+def orden_grilla(clave, columnas, por, ascendente, texto, _t):
+    # Posiciones buscadas y ordenadas; ``clave`` identifica el contenido de ``_t``
+    return grilla.ordenar(_t, list(por), ascendente, grilla.buscar(_t, texto, columnas))
+
+def tabla_paginada(t, key, columnas, orden=(), formato=None):
+    # Búsqueda, orden y paginado en el servidor: solo la página visible va al navegador
+    c1, c2, c3, c4 = st.columns([2, 1.4, .8, 2])
+    texto = c1.text_input("Buscar", key=f"{key}_q", placeholder="Programa, región, edición…")
+    por = c2.selectbox("Ordenar por", ["(por defecto)"] + columnas, key=f"{key}_orden")
+    desc = c3.toggle("Desc.", key=f"{key}_desc")
+    visibles = c4.multiselect("Columnas", columnas, default=columnas, key=f"{key}_cols") or columnas
+    por = tuple(orden) if por == "(por defecto)" else (por,)
+    if len(nuevas):
+        # Con altas pendientes ``t`` es propio de la sesión: no pasa por la caché compartida
+        filas = grilla.ordenar(t, list(por), not desc, grilla.buscar(t, texto, columnas))
+    else:
+        filas = orden_grilla((df_version, filtros, key), tuple(columnas), por, not desc, texto, t)
+
+    n_pag = grilla.paginas(len(filas))
+    if st.session_state.get(f"{key}_pag", 1) > n_pag:
+        st.session_state[f"{key}_pag"] = 1
+    vista = grilla.pagina(t, filas, st.session_state.get(f"{key}_pag", 1), columnas=visibles)
+    st.dataframe(formato(vista) if formato else vista, use_container_width=True, hide_index=True)
+    p1, p2 = st.columns([1, 4])
+    num = p1.number_input("Página", 1, n_pag, key=f"{key}_pag", label_visibility="collapsed")
+    ini = (num - 1) * grilla.POR_PAGINA
+    p2.caption(f"Filas {min(ini + 1, len(filas)):,}–{min(ini + grilla.POR_PAGINA, len(filas)):,} de {len(filas):,} · "
+               f"página {num} de {n_pag}")
+
 # ---------- Tabs ----------
-tabs = st.tabs([
-    "📊 Overview",
-    "👥 Ediciones (editable)",
-    "💵 Ingresos",
-    "🌍 Regiones & Canales",
-    "💳 Pagos & 🎯 Empleabilidad",
-    "🧱 Heatmap",
-    "📝 Datos & Notas"
-])
+# Cada pestaña es un fragmento: solo se ejecuta la activa y las interacciones
+# dentro de ella (editor, formulario de notas) no recalculan las demás.
 
 # ===== Overview =====
-with tabs[0]:
+@st.fragment
+@perf.medido("tab:overview")
+def tab_overview():
     cA, cB = st.columns([1.3, 1], gap="large")
 
-    A = f.groupby(["MesNum","Mes","Programa"], as_index=False)["Estudiantes"].sum().sort_values("MesNum")
-    figA = px.bar(A, x="Mes", y="Estudiantes", color="Programa", barmode="group",
-                  template=tpl, color_discrete_sequence=PALETTE, text_auto=True,
-                  hover_data={"Mes":True,"Programa":True,"Estudiantes":":,"})
-    figA.update_layout(height=360, margin=dict(t=40,b=10,l=10,r=10), legend_title_text="Programa")
     cA.markdown("**Estudiantes por mes × programa**")
-    cA.plotly_chart(figA, use_container_width=True)
+    cA.plotly_chart(figura("mes_programa"), use_container_width=True)
     cA.caption("Volumen mensual por programa, considerando los filtros.")
 
-    B = f.groupby(["MesNum","Mes"], as_index=False)["Estudiantes"].sum().sort_values("MesNum")
-    figB = px.line(B, x="Mes", y="Estudiantes", markers=True, template=tpl)
-    figB.update_traces(hovertemplate="Mes: %{x}<br>Estudiantes: %{y:,}")
-    figB.update_layout(height=360, margin=dict(t=40,b=10,l=10,r=10))
     cB.markdown("**Tendencia mensual de estudiantes**")
-    cB.plotly_chart(figB, use_container_width=True)
-    cB.caption("Evolución de estudiantes durante el año seleccionado.")
+    cB.plotly_chart(figura("tendencia"), use_container_width=True)
+    cB.caption(f"Evolución mes a mes de estudiantes en {periodo}.")
 
     # Conclusiones rápidas
-    top_region = f.groupby("Region")["Estudiantes"].sum().sort_values(ascending=False).index[0]
-    top_canal = f.groupby("CanalDominante")["Estudiantes"].sum().sort_values(ascending=False).index[0]
     st.markdown(f"""
-- **Total estudiantes {year}:** {total_est:,}
-- **Ingresos estimados:** ${int(f["IngresosMXN"].sum()):,} MXN
+- **Total estudiantes {periodo}:** {total_est:,}
+- **Ingresos estimados:** ${ingresos_tot:,} MXN
 - **Programa líder:** {top_prog}
-- **Región más activa:** {top_region}
-- **Canal dominante:** {top_canal}
+- **Región más activa:** {k["top_region"]}
+- **Canal dominante:** {k["top_canal"]}
 - **Empleabilidad (colocados/estudiantes):** {tasa_coloc:.1f}%
 """)
 
 # ===== Ediciones (editable) =====
-with tabs[1]:
-    st.markdown("**Ediciones del año** " + ("(solo lectura en modo externo)" if modo_externo else "(editable)"))
+@st.fragment
+@perf.medido("tab:ediciones")
+def tab_ediciones():
+    f, _ = datos()
+    st.markdown(f"**Ediciones de {periodo}** " + ("(solo lectura en modo externo)" if modo_externo else "(editable)"))
 
     show_cols = [
         "FechaInicio","Año","Mes","Programa","Modalidad","UnidadPrecio","PrecioUnidadMXN",
@@ -346,8 +416,12 @@ with tabs[1]:
         "Colocados",
         "CanalDominante","Region","Edición"
     ]
-    base_table = f[show_cols].copy()
 
+    if modo_externo:
+        tabla_paginada(f, "grid_ed", show_cols)
+        return
+
+    base_table = f[show_cols].copy()
     cfg = {
         "Estudiantes": st.column_config.NumberColumn(min_value=1, max_value=1000, step=1),
         "PrecioUnidadMXN": st.column_config.NumberColumn(min_value=100, max_value=10000, step=50),
@@ -360,194 +434,175 @@ with tabs[1]:
         "Region": st.column_config.SelectboxColumn(options=REGIONES),
     }
 
-    if modo_externo:
-        st.dataframe(base_table, use_container_width=True, hide_index=True)
-    else:
-        edit_df = st.data_editor(base_table, column_config=cfg, hide_index=True, use_container_width=True, num_rows="fixed")
-        c1, c2 = st.columns([1,1])
-        with c1:
-            if st.button("Aplicar cambios a la base", type="primary"):
-                base = st.session_state.df
-                cols_update = [
-                    "Estudiantes","PrecioUnidadMXN",
-                    "PctDebito","PctCredito","PctTransfer","PctPayPal",
-                    "Colocados","CanalDominante","Region"
-                ]
-                merged = base.merge(edit_df[["Edición"] + cols_update], on="Edición", how="left", suffixes=("","_new"))
-
-                # Aplica valores nuevos cuando existan
-                for col in cols_update:
-                    merged[col] = np.where(merged[col+"_new"].notna(), merged[col+"_new"], merged[col])
-                    merged.drop(columns=[col+"_new"], inplace=True)
-
-                # Tipos seguros
-                merged["Estudiantes"]     = pd.to_numeric(merged["Estudiantes"], errors="coerce").fillna(0).astype(int)
-                merged["PrecioUnidadMXN"] = pd.to_numeric(merged["PrecioUnidadMXN"], errors="coerce").fillna(0).astype(int)
-                for c in ["PctDebito","PctCredito","PctTransfer","PctPayPal","Colocados"]:
-                    merged[c] = pd.to_numeric(merged[c], errors="coerce").fillna(0)
-
-                # Normaliza % a 100 y recorta Colocados ≤ Estudiantes
-                for i, row in merged.iterrows():
-                    p = np.array([
-                        row.get("PctDebito", 0.0),
-                        row.get("PctCredito", 0.0),
-                        row.get("PctTransfer", 0.0),
-                        row.get("PctPayPal", 0.0)
-                    ], dtype=float)
-                    p = np.nan_to_num(p, nan=0.0)
-                    s = p.sum()
-                    if s <= 0:
-                        p = np.array([40,20,30,10], dtype=float)
-                        s = 100.0
-                    p = p / s * 100.0
-                    r = np.round(p).astype(int)
-                    r[0] += (100 - r.sum())
-                    r = np.clip(r, 0, 100)
-
-                    merged.loc[i, ["PctDebito","PctCredito","PctTransfer","PctPayPal"]] = r
-                    merged.loc[i, "Colocados"] = min(int(row.get("Colocados", 0)), int(row.get("Estudiantes", 0)))
-
-                st.session_state.df = merged
+    # La llave cambia con la versión: tras aplicar, el editor arranca limpio
+    # y con los filtros: con otro filtro las posiciones de ``edited_rows`` serían otras ediciones
+    editor_key = f"editor_{df_version}_{snapshot.clave(filtros)}"
+    st.data_editor(base_table, column_config=cfg, hide_index=True, use_container_width=True, num_rows="fixed", key=editor_key)
+    c1, c2 = st.columns([1,1])
+    with c1:
+        if st.button("Aplicar cambios a la base", type="primary"):
+            # Solo las celdas editadas, por Edición
+            editadas = st.session_state[editor_key]["edited_rows"]
+            cambios = {base_table["Edición"].iat[int(i)]: v for i, v in editadas.items()}
+            if cambios:
+                parchar_df(cambios)
                 st.toast("Cambios aplicados ✅")
-                st.rerun()
-        with c2:
-            st.info("Los porcentajes de pago se normalizan automáticamente a 100% al aplicar cambios.")
+                salir(st.rerun, accion="aplicar")
+    with c2:
+        st.info("Los porcentajes de pago se normalizan automáticamente a 100% al aplicar cambios.")
 
 # ===== Ingresos =====
-with tabs[2]:
+@st.fragment
+@perf.medido("tab:ingresos")
+def tab_ingresos():
     c1, c2 = st.columns([1.3, 1], gap="large")
-    R = f.groupby(["MesNum","Mes","Programa"], as_index=False)["IngresosMXN"].sum().sort_values("MesNum")
-    figR = px.area(R, x="Mes", y="IngresosMXN", color="Programa",
-                   template=tpl, color_discrete_sequence=PALETTE)
-    figR.update_traces(hovertemplate="Mes: %{x}<br>%{legendgroup}: $%{y:,.0f} MXN")
-    figR.update_layout(height=360, margin=dict(t=40,b=10,l=10,r=10), yaxis_title="MXN", legend_title_text="Programa")
     c1.markdown("**Ingresos por mes × programa (estimado)**")
-    c1.plotly_chart(figR, use_container_width=True)
+    c1.plotly_chart(figura("ingresos"), use_container_width=True)
     c1.caption("Según unidad de cobro (MES/SEM) y duración por programa.")
 
-    tkt = int(f["IngresosMXN"].sum() / f["Estudiantes"].sum()) if f["Estudiantes"].sum() > 0 else 0
+    tkt = int(ingresos_tot / total_est) if total_est > 0 else 0
     c2.markdown("**Indicadores de monetización**")
     c2.metric("Ticket estimado por estudiante", f"${k_formatter(tkt)} MXN")
-    c2.metric("Ingresos totales estimados", f"${k_formatter(int(f['IngresosMXN'].sum()))} MXN")
+    c2.metric("Ingresos totales estimados", f"${k_formatter(ingresos_tot)} MXN")
     c2.caption("Valores aproximados, útiles para planeación y control.")
 
 # ===== Regiones & Canales =====
-with tabs[3]:
+@st.fragment
+@perf.medido("tab:regiones")
+def tab_regiones():
     left, right = st.columns(2, gap="large")
-    G = f.groupby("Region", as_index=False)["Estudiantes"].sum().rename(columns={"Estudiantes":"TotalEstudiantes"}).sort_values("TotalEstudiantes")
-    figG = px.bar(G, x="TotalEstudiantes", y="Region", orientation="h",
-                  template=tpl, color_discrete_sequence=PALETTE, text="TotalEstudiantes")
-    figG.update_traces(texttemplate="%{text:,}", hovertemplate="%{y}<br>Estudiantes: %{x:,}")
-    figG.update_layout(height=max(260, 28*len(G)), margin=dict(t=30,b=10,l=10,r=10))
     left.markdown("**Top regiones (por estudiantes)**")
-    left.plotly_chart(figG, use_container_width=True)
+    left.plotly_chart(figura("regiones"), use_container_width=True)
     left.caption("Suma de estudiantes por región.")
 
-    C = f.groupby("CanalDominante", as_index=False)["Estudiantes"].sum().rename(columns={"Estudiantes":"TotalEstudiantes"})
-    figC = px.bar(C, x="CanalDominante", y="TotalEstudiantes",
-                  template=tpl, color_discrete_sequence=PALETTE, text="TotalEstudiantes")
-    figC.update_traces(texttemplate="%{text:,}", hovertemplate="%{x}<br>Estudiantes: %{y:,}")
-    figC.update_layout(height=320, margin=dict(t=30,b=10,l=10,r=10), xaxis_title="Canal", yaxis_title="Estudiantes")
     right.markdown("**Canales de adquisición (por estudiantes)**")
-    right.plotly_chart(figC, use_container_width=True)
+    right.plotly_chart(figura("canales"), use_container_width=True)
     right.caption("Principales fuentes de adquisición.")
 
 # ===== Pagos & Empleabilidad =====
-with tabs[4]:
+@st.fragment
+@perf.medido("tab:pagos")
+def tab_pagos():
     left, right = st.columns([1,1], gap="large")
 
-    # Mezcla de pagos (por estudiantes)
-    pagos = pd.DataFrame({
-        "Método": ["Débito","Crédito","Transferencia","PayPal"],
-        "Estudiantes": [
-            f["Est_Debito"].sum(),
-            f["Est_Credito"].sum(),
-            f["Est_Transfer"].sum(),
-            f["Est_PayPal"].sum(),
-        ]
-    })
-    figPie = px.pie(pagos, names="Método", values="Estudiantes", template=tpl, hole=0.45)
-    figPie.update_traces(textinfo="percent+label", hovertemplate="%{label}: %{value:,} estudiantes")
-    figPie.update_layout(height=360, margin=dict(t=30,b=10,l=10,r=10))
     left.markdown("**Mezcla de métodos de pago (estudiantes)**")
-    left.plotly_chart(figPie, use_container_width=True)
-
-    # Colocación por programa
-    emp = f.groupby("Programa", as_index=False).agg(Estudiantes=("Estudiantes","sum"), Colocados=("Colocados","sum"))
-    emp["Tasa"] = np.where(emp["Estudiantes"]>0, emp["Colocados"]/emp["Estudiantes"]*100, 0)
-    figEmp = px.bar(emp.sort_values("Tasa"), x="Tasa", y="Programa", orientation="h",
-                    template=tpl, color_discrete_sequence=PALETTE, text=emp["Tasa"].map(lambda x:f"{x:.1f}%"))
-    figEmp.update_traces(
-        hovertemplate="%{y}<br>Tasa: %{x:.1f}%<br>Colocados: %{customdata[0]:,} / %{customdata[1]:,}",
-        customdata=np.stack([emp["Colocados"], emp["Estudiantes"]], axis=1)
-    )
-    figEmp.update_layout(height=max(260, 30*len(emp)), margin=dict(t=30,b=10,l=10,r=10), xaxis_title="Tasa de colocación (%)")
+    left.plotly_chart(figura("pagos"), use_container_width=True)
+
     right.markdown("**Empleabilidad por programa**")
-    right.plotly_chart(figEmp, use_container_width=True)
+    right.plotly_chart(figura("empleabilidad"), use_container_width=True)
     right.caption("Colocados / Estudiantes por programa (editable por edición).")
 
 # ===== Heatmap =====
-with tabs[5]:
-    H = f.groupby(["MesNum","Mes","Programa"], as_index=False)["Estudiantes"].sum()
-    pivot = H.pivot_table(index="Programa", columns="Mes", values="Estudiantes", aggfunc="sum").reindex(columns=MONTHS).fillna(0)
-    heat = go.Figure(data=go.Heatmap(
-        z=pivot.values, x=pivot.columns, y=pivot.index,
-        colorscale="Blues", hovertemplate="Programa: %{y}<br>Mes: %{x}<br>Estudiantes: %{z}<extra></extra>",
-        colorbar=dict(title="Estudiantes")
-    ))
-    heat.update_layout(template=tpl, height=max(260, 28*len(pivot.index)), margin=dict(t=40,b=10,l=10,r=10))
+@st.fragment
+@perf.medido("tab:heatmap")
+def tab_heatmap():
     st.markdown("**Heatmap Mes × Programa**")
-    st.plotly_chart(heat, use_container_width=True)
+    st.plotly_chart(figura("heatmap"), use_container_width=True)
     st.caption("Picos y valles por programa y mes.")
 
+# ===== Proyecciones =====
+@st.cache_resource(max_entries=32, show_spinner=False)
+def proyeccion(version, anio, escenarios, precio, cohorte, _base):
+    # Una simulación por juego de parámetros (compartida entre sesiones)
+    return proyecciones.simular(proyecciones.ediciones_esperadas(_base), anio, escenarios, precio, cohorte)
+
+@st.fragment
+@perf.medido("tab:proyecciones")
+def tab_proyecciones():
+    anio = max(anios_disp) + 1
+    st.markdown(f"**Proyección {anio} (Monte Carlo)**")
+    s1, s2, s3 = st.columns(3)
+    precio = s1.slider("Precio (%)", -30, 30, 0, step=5, key="proy_precio")
+    cohorte = s2.slider("Tamaño de cohorte (%)", -30, 50, 0, step=5, key="proy_cohorte")
+    escenarios = s3.select_slider("Escenarios", [50_000, 100_000, 250_000], value=100_000,
+                                  format_func=k_formatter, key="proy_n")
+    bandas = proyeccion(df_version, anio, escenarios, 1 + precio / 100, 1 + cohorte / 100, df)
+
+    tot = bandas[bandas["Programa"] == "Total"].set_index("Medida")
+    m1, m2, m3 = st.columns(3)
+    for col, medida, txt, pre in ((m1, "Estudiantes", "Estudiantes", ""), (m2, "IngresosMXN", "Ingresos", "$"),
+                                  (m3, "Colocados", "Colocados", "")):
+        r = tot.loc[medida]
+        col.metric(f"{txt} (P50)", f"{pre}{k_formatter(r['P50'])}")
+        col.caption(f"P10–P90: {pre}{k_formatter(r['P10'])} – {pre}{k_formatter(r['P90'])}")
+
+    medida = st.radio("Medida", proyecciones.MEDIDAS, horizontal=True, key="proy_medida")
+    st.plotly_chart(figuras.proyeccion(bandas, medida, tpl), use_container_width=True)
+    st.caption("Ediciones por programa con la media histórica de la base; estudiantes, pagos y colocación "
+               "con las distribuciones del modelo de negocio. Barras: P50; líneas: P10–P90.")
+
 # ===== Datos & Notas =====
-with tabs[6]:
-    t1, t2 = st.tabs(["📄 Datos (filtrados)", "🗒️ Notas del equipo"])
-    with t1:
-        st.markdown("**Tabla base (con ingresos y pagos normalizados)**")
-        show = f.copy()
-        # A prueba de NaN/inf antes de convertir a int
-        show["IngresosMXN"] = pd.to_numeric(show["IngresosMXN"], errors="coerce") \
-            .replace([np.inf, -np.inf], np.nan) \
-            .fillna(0) \
-            .round(0) \
-            .astype("int64")
-        show = show.sort_values(["MesNum","Programa"])
-        st.dataframe(show, use_container_width=True, hide_index=True)
-        st.download_button("Descargar CSV filtrado", show.to_csv(index=False).encode("utf-8"),
-                           file_name=f"cursos_{year}.csv", mime="text/csv")
-    with t2:
-        if modo_externo:
-            st.info("Modo externo activo: las notas internas están ocultas.")
+@st.fragment
+@perf.medido("tab:datos")
+def tab_datos():
+    f, _ = datos()
+    st.markdown("**Tabla base (con ingresos y pagos normalizados)**")
+    tabla_paginada(f, "grid_datos", list(f.columns), pipeline.ORDEN_DATOS, pipeline.formato_datos)
+    descargas(lambda: pipeline.tabla_datos(f), "Descargar filtrado", f"cursos_{periodo}", "dl_datos")
+
+@st.fragment
+@perf.medido("tab:notas")
+def tab_notas():
+    if modo_externo:
+        st.info("Modo externo activo: las notas internas están ocultas.")
+    else:
+        with st.form("add_note"):
+            nc1, nc2 = st.columns([3,1])
+            with nc1:
+                note_text = st.text_area("Escribe una nota (visible para el equipo):", height=120,
+                                         placeholder="Ej. Ajustar pauta para crédito; seguimiento empleabilidad en DS…")
+            with nc2:
+                note_prog = st.selectbox("Programa", ["(General)"]+sorted(df["Programa"].unique()))
+                note_tag  = st.selectbox("Etiqueta", TAGS)
+                submitted = st.form_submit_button("Guardar nota", use_container_width=True)
+            if submitted and note_text.strip():
+                notas().agregar(note_text.strip(), note_prog, note_tag, anio=year)
+                st.toast("Nota guardada 🗒️")
+        # Solo la página visible sale de SQLite: el costo no crece con el historial
+        n1, n2, n3, n4 = st.columns([1.4, 1.4, 1, .8])
+        f_tags = n1.multiselect("Etiquetas", TAGS, key="notas_tags", placeholder="Todas")
+        f_progs = n2.multiselect("Programas", notas().programas(), key="notas_progs", placeholder="Todos")
+        solo_periodo = n3.toggle(f"Solo {periodo}", key="notas_periodo")
+        filtros_notas = dict(tags=f_tags or None, programas=f_progs or None,
+                             anios=[int(a) for a in anios] if solo_periodo else None)
+        total = notas().contar(**filtros_notas)
+        if total:
+            n_pag = grilla.paginas(total, NOTAS_POR_PAGINA)
+            if st.session_state.get("notas_pag", 1) > n_pag:
+                st.session_state["notas_pag"] = 1
+            num = n4.number_input("Página", 1, n_pag, key="notas_pag")
+            pagina = notas().recientes(NOTAS_POR_PAGINA, (num - 1) * NOTAS_POR_PAGINA, **filtros_notas)
+            st.markdown(f"**Notas recientes** <span class='small'>· {total:,} en total</span>", unsafe_allow_html=True)
+            st.markdown("".join(
+                f"<div class='card'><span class='note-pill'>{escape(r.tag)}</span> "
+                f"<b>{escape(r.programa)}</b> · <span class='small'>{r.ts}</span><br>{escape(r.nota)}</div>"
+                for r in pagina.itertuples()), unsafe_allow_html=True)
+            descargas(lambda: notas().frame(**filtros_notas), "Descargar notas", "notas_dashboard", "dl_notas")
+        elif any(v is not None for v in filtros_notas.values()):
+            st.info("Ninguna nota cumple estos filtros.")
         else:
-            with st.form("add_note"):
-                nc1, nc2 = st.columns([3,1])
-                with nc1:
-                    note_text = st.text_area("Escribe una nota (visible para el equipo):", height=120,
-                                             placeholder="Ej. Ajustar pauta para crédito; seguimiento empleabilidad en DS…")
-                with nc2:
-                    note_prog = st.selectbox("Programa", ["(General)"]+sorted(df["Programa"].unique()))
-                    note_tag  = st.selectbox("Etiqueta", ["riesgo","idea","tarea","seguimiento","dato"])
-                    submitted = st.form_submit_button("Guardar nota", use_container_width=True)
-                if submitted and note_text.strip():
-                    st.session_state.notes.append({
-                        "ts": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                        "año": year, "programa": note_prog, "tag": note_tag, "nota": note_text.strip()
-                    })
-                    st.toast("Nota guardada 🗒️")
-            if st.session_state.notes:
-                notes_df = pd.DataFrame(st.session_state.notes).sort_values("ts", ascending=False)
-                st.markdown("**Notas recientes**")
-                for _, r in notes_df.iterrows():
-                    st.markdown(
-                        f"<div class='card'><span class='note-pill'>{r['tag']}</span> "
-                        f"<b>{r['programa']}</b> · <span class='small'>{r['ts']}</span><br>{r['nota']}</div>",
-                        unsafe_allow_html=True
-                    )
-                st.download_button("Descargar notas (CSV)", notes_df.to_csv(index=False).encode("utf-8"),
-                                   file_name="notas_dashboard.csv", mime="text/csv")
-            else:
-                st.info("Aún no hay notas. Usa el formulario para registrar hallazgos, tareas o ideas.")
+            st.info("Aún no hay notas. Usa el formulario para registrar hallazgos, tareas o ideas.")
+
+def tab_datos_notas():
+    sub = st.radio("Sub-sección", ["📄 Datos (filtrados)", "🗒️ Notas del equipo"],
+                   horizontal=True, label_visibility="collapsed", key="subtab")
+    if sub.startswith("📄"):
+        tab_datos()
+    else:
+        tab_notas()
+
+TABS = {
+    "📊 Overview": tab_overview,
+    "👥 Ediciones (editable)": tab_ediciones,
+    "💵 Ingresos": tab_ingresos,
+    "🌍 Regiones & Canales": tab_regiones,
+    "💳 Pagos & 🎯 Empleabilidad": tab_pagos,
+    "🧱 Heatmap": tab_heatmap,
+    "🔮 Proyecciones": tab_proyecciones,
+    "📝 Datos & Notas": tab_datos_notas,
+}
+tab = st.radio("Sección", list(TABS), horizontal=True, label_visibility="collapsed", key="tab")
+TABS[tab]()
 
 # ---------- Pie ----------
 st.markdown("<hr class='sep'/>", unsafe_allow_html=True)
@@ -558,3 +613,19 @@ with st.expander("ℹ️ ¿Qué incluye este dashboard?"):
 - **Edición por edición**: estudiantes, precios, **porcentajes de pago** (normalizados a 100%) y **colocados**.
 - **Modo externo** para presentar sin edición/Notas.
 """)
+
+# ---------- Diagnóstico (solo interno) ----------
+tiempos, perfil = perf.cerrar(corrida, tab=tab, filas=k["filas"], snapshot=snap is not None, version=df_version)
+if perfil:
+    st.session_state._perfil = perfil
+if not modo_externo:
+    with st.sidebar.expander("⏱️ Diagnóstico de rendimiento"):
+        st.caption(f"Esta recarga: {tiempos['total']*1e3:,.0f} ms · historial del proceso (p50/p95 de las últimas {perf.HISTORIAL})")
+        resumen = perf.REGISTRO.resumen()
+        resumen.insert(1, "Esta recarga ms", resumen["Etapa"].map(tiempos).mul(1e3))
+        st.dataframe(resumen.round(1), hide_index=True, use_container_width=True)
+        if st.button("Perfilar la próxima recarga (cProfile)", use_container_width=True):
+            st.session_state._perfilar = True
+            salir(st.rerun)
+        if "_perfil" in st.session_state:
+            st.code(st.session_state._perfil, language=None)
@@ -0,0 +1 @@
+"""Lógica del dashboard de cursos sin dependencias de Streamlit."""
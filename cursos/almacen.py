@@ -0,0 +1,158 @@
+# cursos/almacen.py
+"""Almacén de ediciones compartido por proceso.
+
+La base se lee una sola vez por proceso desde un Parquet local (mapeado en
+memoria) y todas las sesiones leen el mismo DataFrame sin copiarlo. Las
+ediciones de una sesión producen frames nuevos (copy-on-write) que viven en la
+sesión hasta que se publican con ``guardar``, que reescribe el archivo de forma
+atómica y cambia la versión compartida. Las altas una a una van a una
+``Bitacora`` que se compacta sobre la base por lotes.
+
+Si el archivo no existe (contenedor nuevo), se copia la base prearmada
+``SEMILLA`` en vez de regenerarla; ``python -m cursos.generador`` la reconstruye.
+"""
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from cursos.esquema import COLS, aplicar_esquema
+
+RUTA_DEFAULT = Path(os.environ.get("CURSOS_DATA", Path(__file__).resolve().parent.parent / "data" / "ediciones.parquet"))
+SEMILLA = Path(os.environ.get("CURSOS_SEMILLA", Path(__file__).resolve().parent / "semilla.parquet"))
+
+
+def version_de(base):
+    """Hash de contenido: frames iguales comparten versión (y caché)."""
+    h = pd.util.hash_pandas_object(base, index=True).to_numpy()
+    return hashlib.blake2b(h.tobytes() + ",".join(base.columns).encode(), digest_size=12).hexdigest()
+
+
+def leer_parquet(ruta):
+    return aplicar_esquema(pd.read_parquet(ruta, engine="pyarrow", memory_map=True))
+
+
+def escribir_parquet(base, ruta):
+    # Escribe a un temporal y reemplaza: los lectores nunca ven un archivo a medias
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ruta.with_suffix(ruta.suffix + ".tmp")
+    base.to_parquet(tmp, engine="pyarrow", index=False)
+    os.replace(tmp, ruta)
+
+
+class Almacen:
+    """Base compartida de solo lectura + publicación atómica de cambios.
+
+    Si el archivo no existe todavía se copia ``semilla`` (Parquet prearmado)
+    y, si tampoco existe, se escribe ``sembrar()``. Si otro proceso reescribe
+    el archivo (p. ej. ``python -m cursos.ingesta``), ``leer`` y ``guardar``
+    lo notan por su mtime/tamaño y vuelven a leerlo.
+    """
+
+    def __init__(self, ruta=RUTA_DEFAULT, sembrar=None, semilla=SEMILLA):
+        self.ruta = Path(ruta)
+        self._lock = threading.Lock()
+        if not self.ruta.exists() and semilla is not None and Path(semilla).exists():
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.ruta.with_suffix(self.ruta.suffix + ".tmp")
+            shutil.copyfile(semilla, tmp)
+            os.replace(tmp, self.ruta)
+        if self.ruta.exists():
+            base = leer_parquet(self.ruta)
+        elif sembrar is not None:
+            base = aplicar_esquema(sembrar())
+            escribir_parquet(base, self.ruta)
+        else:
+            raise FileNotFoundError(self.ruta)
+        # (frame, versión) se reemplaza como una sola tupla
+        self._estado = (base, version_de(base))
+        self._disco = self._firma()
+
+    def _firma(self):
+        try:
+            st = os.stat(self.ruta)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _recargar(self):
+        # Con el lock tomado: el archivo cambió fuera de este proceso -> se adopta esa versión
+        firma = self._firma()
+        if firma is not None and firma != self._disco:
+            base = leer_parquet(self.ruta)
+            self._estado, self._disco = (base, version_de(base)), firma
+
+    @property
+    def df(self):
+        return self._estado[0]
+
+    @property
+    def version(self):
+        return self._estado[1]
+
+    def leer(self):
+        """(frame, versión) consistentes entre sí. El frame no debe mutarse."""
+        if self._firma() != self._disco:
+            with self._lock:
+                self._recargar()
+        return self._estado
+
+    def guardar(self, base, origen=None):
+        """Publica ``base`` como nueva versión compartida y la persiste.
+
+        ``origen`` es la versión de la que partieron los cambios; si otra
+        sesión u otro proceso publicó después, lanza ValueError en vez de
+        pisar sus cambios.
+        """
+        base = aplicar_esquema(base)
+        with self._lock:
+            self._recargar()
+            if origen is not None and origen != self._estado[1]:
+                raise ValueError("La base compartida cambió desde que empezaste a editarla")
+            escribir_parquet(base, self.ruta)
+            self._estado, self._disco = (base, version_de(base)), self._firma()
+        return self._estado
+
+
+class Bitacora:
+    """Registro de altas pendientes (delta) sobre una base.
+
+    Agregar una edición es O(1): la fila se guarda en una lista y el frame
+    se arma solo cuando se lee. Se compacta sobre la base al pasar ``umbral``.
+    """
+
+    def __init__(self, umbral=200):
+        self.umbral = umbral
+        self.filas = []
+        self._claves = set()
+        self._frame = None
+
+    def __len__(self):
+        return len(self.filas)
+
+    def agregar(self, fila, claves_base=()):
+        """Agrega ``fila`` (dict con las columnas de COLS).
+
+        Lanza ValueError si su ``Edición`` ya existe en la base o en el delta.
+        """
+        clave = fila["Edición"]
+        if clave in claves_base or clave in self._claves:
+            raise ValueError(f"La edición {clave} ya existe")
+        self.filas.append(fila)
+        self._claves.add(clave)
+        self._frame = None
+
+    def lleno(self):
+        return len(self.filas) >= self.umbral
+
+    def frame(self):
+        if self._frame is None:
+            self._frame = aplicar_esquema(pd.DataFrame(self.filas, columns=COLS))
+        return self._frame
+
+    def limpiar(self):
+        self.filas, self._claves, self._frame = [], set(), None
@@ -0,0 +1,254 @@
+# cursos/bench.py
+"""Benchmarks de las etapas del dashboard con datos sintéticos.
+
+Cada etapa de ``cursos.pipeline`` se mide por separado a varios tamaños de
+base: tiempo de pared (mejor de ``--repeticiones``) y pico de memoria
+(``tracemalloc``, en una corrida aparte). Los resultados van a un JSON y se
+comparan contra un baseline guardado; una etapa que empeora más de
+``--tolerancia`` se marca como regresión y el comando sale con código 1.
+
+``arranque`` mide un arranque en frío: un proceso nuevo que importa lo mismo
+que ``app.py``, lee la base desde Parquet y calcula los KPIs por defecto (lo
+que se pinta antes del primer gráfico). Su memoria es el RSS máximo del
+proceso, no ``tracemalloc``; falla si ese camino llega a importar Plotly Express.
+
+``--motor`` elige el motor de filtro/agregación (ver ``cursos.motor``);
+``--paridad`` no mide tiempos: compara los frames de cada motor contra
+pandas con varios filtros, también desde varios hilos a la vez sobre el
+mismo motor (como lo comparten las sesiones de la app), y sale con código 1
+si alguno difiere.
+
+Uso::
+
+    python -m cursos.bench [--tamanos 1000 100000] [--motor duckdb] [--guardar-baseline]
+    python -m cursos.bench --paridad [--tamanos 1000 100000]
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cursos import figuras, motor, pipeline
+from cursos.almacen import escribir_parquet
+from cursos.exportar import FORMATOS, exportar
+from cursos.catalogos import CANALES, DISCIP, REGIONES
+from cursos.generador import YEARS, generar
+
+RAIZ = Path(__file__).resolve().parent.parent / "bench"
+TAMANOS = [1_000, 100_000, 1_000_000, 10_000_000]
+# Diferencias menores a esto son ruido aunque superen la tolerancia
+PISO_SEG = 0.005
+PISO_MB = 1.0
+# Paridad concurrente: hilos × vueltas sobre los mismos filtros
+HILOS = 8
+VUELTAS = 30
+
+# Imports de app.py + lectura de la base + KPIs por defecto, en un proceso nuevo
+ARRANQUE = """
+import resource, sys
+import streamlit
+from cursos import figuras, grilla, perf, pipeline, proyecciones, snapshot
+from cursos.almacen import Almacen
+base = Almacen(sys.argv[1]).df
+filtros = ((int(base["Año"].max()),), *snapshot.opciones(base))
+pipeline.kpis(*pipeline.filtrar(pipeline.preparar(base), *filtros))
+assert "plotly.express" not in sys.modules, "Plotly Express se importa antes del primer gráfico"
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def medir(fn, repeticiones=3):
+    """(resultado, segundos, pico_mb) de ``fn()``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        out = fn()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        out = None  # no mantener dos resultados grandes vivos a la vez
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return out, mejor, pico / 2**20
+
+
+def arranque(base, repeticiones=3):
+    """(segundos, rss_mb) del arranque en frío sobre ``base`` (mejor de ``repeticiones``)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "ediciones.parquet"
+        escribir_parquet(base, ruta)
+        mejor, rss = float("inf"), 0.0
+        for _ in range(max(1, repeticiones)):
+            t0 = time.perf_counter()
+            out = subprocess.run([sys.executable, "-c", ARRANQUE, str(ruta)], cwd=RAIZ.parent,
+                                 capture_output=True, text=True, check=True)
+            mejor = min(mejor, time.perf_counter() - t0)
+            rss = max(rss, int(out.stdout) / 2**10)  # ru_maxrss viene en KiB
+    return mejor, rss
+
+
+def _por_defecto(base):
+    # Filtros por defecto de la barra lateral: último año, todo lo demás
+    return ((YEARS[-1],), tuple(sorted(base["Programa"].cat.categories)), tuple(sorted(CANALES)),
+            tuple(sorted(REGIONES)), tuple(sorted(DISCIP)))
+
+
+def etapas(filas, repeticiones=3, semilla=42, nombre_motor=None):
+    """Corre el pipeline completo sobre ``filas`` ediciones; itera (etapa, seg, mb)."""
+    base, s, mb = medir(lambda: generar(filas, semilla=semilla), repeticiones)
+    yield "generar", s, mb
+    m, s, mb = medir(lambda: pipeline.preparar(base, nombre_motor), repeticiones)
+    yield "preparar", s, mb
+    filtros = _por_defecto(base)
+    (f, q), s, mb = medir(lambda: pipeline.filtrar(m, *filtros), repeticiones)
+    yield "filtrar", s, mb
+    _, s, mb = medir(lambda: pipeline.kpis(f, q), repeticiones)
+    yield "kpis", s, mb
+    tpl = figuras.px_template("Claro")
+    _, s, mb = medir(lambda: [fn(q, tpl) for fn in figuras.FIGURAS.values()], repeticiones)
+    yield "figuras", s, mb
+    show, s, mb = medir(lambda: pipeline.tabla_datos(f), repeticiones)
+    yield "tabla", s, mb
+    for fmt in FORMATOS:
+        _, s, mb = medir(lambda: exportar(show, fmt), repeticiones)
+        yield fmt, s, mb
+    s, mb = arranque(base, repeticiones)
+    yield "arranque", s, mb
+
+
+def correr(tamanos=TAMANOS, repeticiones=3, salida=None, nombre_motor=None):
+    resultados = []
+    # Calentamiento: imports diferidos y plantillas de Plotly fuera de la medición
+    for _ in etapas(1_000, repeticiones=0, nombre_motor=nombre_motor):
+        pass
+    for n in tamanos:
+        for etapa, s, mb in etapas(n, repeticiones, nombre_motor=nombre_motor):
+            resultados.append({"etapa": etapa, "filas": n, "segundos": round(s, 6), "pico_mb": round(mb, 2)})
+            print(f"{n:>12,} {etapa:<10} {s:>10.4f}s {mb:>10.1f} MB", file=salida, flush=True)
+        gc.collect()
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "motor": nombre_motor or motor.MOTOR_DEFAULT,
+        "maquina": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def paridad(tamanos=TAMANOS, semilla=42, salida=None):
+    """Filtros donde algún motor devuelve frames distintos a pandas: [(filas, motor, filtros)]."""
+    difieren = []
+    for n in tamanos:
+        base = generar(n, semilla=semilla)
+        todos = _por_defecto(base)
+        progs = todos[1]
+        casos = [todos,
+                 (tuple(YEARS), *todos[1:]),
+                 ((YEARS[0], YEARS[-1]), progs[:2], todos[2][:1], *todos[3:]),
+                 (todos[0], progs[-1:], todos[2], todos[3][:2], todos[4][:1]),
+                 ((YEARS[-1],), (), *todos[2:])]
+        ref = motor.crear(base, "pandas")
+        for nombre in motor.MOTORES:
+            if nombre == "pandas":
+                continue
+            m = motor.crear(base, nombre)
+            iguales = m.cubo.equals(ref.cubo)
+            malos = []
+            esperado = [ref.filtrar(*filtros) for filtros in casos]
+
+            def ok(i):
+                # Una excepción en un hilo cuenta como diferencia
+                try:
+                    f, q = m.filtrar(*casos[i])
+                except Exception:
+                    return False
+                return f.equals(esperado[i][0]) and q.equals(esperado[i][1])
+
+            for i, filtros in enumerate(casos):
+                if not (iguales and ok(i)):
+                    malos.append((n, nombre, filtros))
+            with ThreadPoolExecutor(HILOS) as pool:
+                res = list(pool.map(ok, [i for _ in range(VUELTAS) for i in range(len(casos))]))
+            for i, filtros in enumerate(casos):
+                if not all(res[i::len(casos)]) and (n, nombre, filtros) not in malos:
+                    malos.append((n, nombre, filtros))
+            print(f"{n:>12,} {nombre:<10} {'DIFIERE' if malos else 'OK'}", file=salida, flush=True)
+            difieren += malos
+    return difieren
+
+
+def regresiones(actual, baseline, tolerancia=0.25):
+    """Etapas de ``actual`` más lentas o pesadas que ``baseline`` por más de ``tolerancia``."""
+    previo = {(r["etapa"], r["filas"]): r for r in baseline["resultados"]}
+    malas = []
+    for r in actual["resultados"]:
+        b = previo.get((r["etapa"], r["filas"]))
+        if b is None:
+            continue
+        for medida, piso in (("segundos", PISO_SEG), ("pico_mb", PISO_MB)):
+            if r[medida] > b[medida] * (1 + tolerancia) and r[medida] - b[medida] > piso:
+                malas.append({"etapa": r["etapa"], "filas": r["filas"], "medida": medida,
+                              "baseline": b[medida], "actual": r[medida],
+                              "razon": round(r[medida] / b[medida], 2) if b[medida] else None})
+    return malas
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cursos.bench", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS, help="filas por corrida (default: %(default)s)")
+    ap.add_argument("--repeticiones", type=int, default=3, help="corridas cronometradas por etapa (default: %(default)s)")
+    ap.add_argument("--salida", default=str(RAIZ / "resultados.json"), help="JSON de resultados (default: %(default)s)")
+    ap.add_argument("--baseline", default=str(RAIZ / "baseline.json"), help="JSON de referencia (default: %(default)s)")
+    ap.add_argument("--tolerancia", type=float, default=0.25, help="empeoramiento tolerado, 0.25 = 25%% (default: %(default)s)")
+    ap.add_argument("--guardar-baseline", action="store_true", help="guarda estos resultados como el nuevo baseline")
+    ap.add_argument("--motor", choices=list(motor.MOTORES), default=None,
+                    help=f"motor de filtro/agregación (default: {motor.MOTOR_DEFAULT})")
+    ap.add_argument("--paridad", action="store_true", help="solo compara los resultados de cada motor contra pandas")
+    args = ap.parse_args(argv)
+
+    if args.paridad:
+        difieren = paridad(args.tamanos)
+        for n, nombre, filtros in difieren:
+            print(f"DIFIERE {nombre} @ {n:,} filas: {filtros}")
+        return 1 if difieren else 0
+
+    actual = correr(args.tamanos, args.repeticiones, nombre_motor=args.motor)
+    baseline = Path(args.baseline)
+    if baseline.exists() and not args.guardar_baseline:
+        actual["regresiones"] = regresiones(actual, json.loads(baseline.read_text()), args.tolerancia)
+    else:
+        actual["regresiones"] = []
+
+    salida = Path(args.salida)
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    salida.write_text(json.dumps(actual, indent=1, ensure_ascii=False))
+    if args.guardar_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(json.dumps(actual, indent=1, ensure_ascii=False))
+        print(f"Baseline guardado en {baseline}")
+
+    for r in actual["regresiones"]:
+        print(f"REGRESIÓN {r['etapa']} @ {r['filas']:,} filas: {r['medida']} "
+              f"{r['baseline']} -> {r['actual']} (x{r['razon']})")
+    return 1 if actual["regresiones"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
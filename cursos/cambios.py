@@ -0,0 +1,84 @@
+# cursos/cambios.py
+"""Aplicación incremental de cambios del editor de ediciones.
+
+Solo se tocan las filas editadas: se localizan por ``Edición`` con un índice
+hash, se validan/normalizan en un sub-frame de k filas y se escriben de vuelta
+por posición. El costo depende de k, no del tamaño de la base.
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from cursos.derivados import PCT_COLS, normalize_pcts
+from cursos.esquema import ENTEROS
+
+COLS_EDITABLES = ["Estudiantes","PrecioUnidadMXN", *PCT_COLS, "Colocados","CanalDominante","Region"]
+
+
+def indice_ediciones(base):
+    """Índice Edición -> posición. Se reutiliza mientras no cambien las filas."""
+    return pd.Index(base["Edición"])
+
+
+def _posiciones(indice, clave):
+    try:
+        loc = indice.get_loc(clave)
+    except KeyError:
+        return np.empty(0, dtype=np.intp)
+    if isinstance(loc, slice):
+        return np.arange(len(indice))[loc]
+    if isinstance(loc, np.ndarray):
+        return np.flatnonzero(loc)
+    return np.array([loc], dtype=np.intp)
+
+
+def aplicar_cambios(base, cambios, indice=None):
+    """Aplica EN SITIO ``cambios`` = {Edición: {columna: valor}} sobre ``base``.
+
+    Solo se consideran COLS_EDITABLES; una celda vaciada (None) o inválida
+    deja el valor como estaba. En las filas tocadas los Pct* se normalizan a
+    100 y Colocados se recorta a Estudiantes. Devuelve las posiciones
+    modificadas.
+    """
+    indice = indice_ediciones(base) if indice is None else indice
+    por_fila = {}
+    for clave, cols in cambios.items():
+        cols = {c: v for c, v in cols.items() if c in COLS_EDITABLES}
+        if cols:
+            for p in _posiciones(indice, clave):
+                por_fila.setdefault(int(p), {}).update(cols)
+    if not por_fila:
+        return np.empty(0, dtype=np.intp)
+
+    pos = np.fromiter(por_fila, dtype=np.intp)
+    sub = base.iloc[pos][COLS_EDITABLES].reset_index(drop=True)
+    nuevos = pd.DataFrame(list(por_fila.values()), columns=COLS_EDITABLES)
+    for c in COLS_EDITABLES:
+        if c in ENTEROS:
+            v = pd.to_numeric(nuevos[c], errors="coerce")
+            # Celda no editada, vaciada o no numérica -> se conserva el valor actual
+            sub[c] = np.where(v.notna(), v, sub[c])
+        else:
+            # Categóricas: valores fuera de catálogo se ignoran
+            v = pd.Series(pd.Categorical(nuevos[c], dtype=base[c].dtype))
+            sub[c] = v.where(v.notna(), sub[c])
+
+    # Validación/normalización solo sobre las filas tocadas
+    sub[PCT_COLS] = normalize_pcts(sub[PCT_COLS].to_numpy(dtype=float))
+    sub["Colocados"] = np.minimum(sub["Colocados"], sub["Estudiantes"])
+
+    for c in COLS_EDITABLES:
+        vals = sub[c]
+        if c in ENTEROS:
+            vals = vals.round().astype(ENTEROS[c])
+        base.iloc[pos, base.columns.get_loc(c)] = vals.to_numpy()
+    return pos
+
+
+def version_parche(version, cambios):
+    """Versión nueva derivada de la anterior + el parche (sin re-hashear la base)."""
+    h = hashlib.blake2b(version.encode(), digest_size=12)
+    h.update(json.dumps(cambios, sort_keys=True, default=str).encode())
+    return h.hexdigest()
@@ -0,0 +1,16 @@
+# cursos/catalogos.py
+"""Catálogos fijos del dashboard (programas, regiones, canales, disciplinas, meses)."""
+
+# (Programa, Modalidad, UnidadPrecio, PrecioUnidadMXN, DuraciónMeses, DuraciónSemanas)
+PROGRAMAS = [
+    ("Data Science", "Curso 6 meses", "MES", 1500, 6, None),
+    ("Análisis de Datos", "Taller 8 semanas", "SEM", 700, None, 8),
+    ("Desarrollo Web No-Code", "Taller 9 semanas", "SEM", 1400, None, 9),
+    ("Excel Básico & Analítica", "Taller 8 semanas", "SEM", 500, None, 8),
+    ("MCP Avanzado (AI+MCP)", "Bootcamp 12 semanas", "SEM", 2500, None, 12),
+    ("Bootcamp IA/Datos (Intensivo)", "Bootcamp 8 meses", "MES", 3000, 8, None),
+]
+REGIONES = ["CDMX (MX)","Monterrey (MX)","Guadalajara (MX)","Tijuana (MX)","Bogotá (CO)","Medellín (CO)","Auckland (NZ)","Madrid (ES)"]
+CANALES  = ["Influencers (micro)","Referidos","Grupos Facebook","LinkedIn"]
+DISCIP   = ["STEM","Derecho","Economía","Sociología","Diseño","Administración","Profesorado"]
+MONTHS   = ["Ene","Feb","Mar","Abr","May","Jun","Jul","Ago","Sep","Oct","Nov","Dic"]
@@ -0,0 +1,48 @@
+# cursos/cubo.py
+"""Cubo OLAP pre-agregado.
+
+Se construye una vez por versión de datos a partir de la base derivada y
+guarda sumas por (Año, MesNum, Programa, Region, CanalDominante, Disciplina).
+Gráficos y KPIs salen de rebanar + agregar sobre el cubo, que tiene a lo más
+unas miles de celdas sin importar cuántas ediciones haya.
+"""
+import pandas as pd
+
+DIMS = ["Año", "MesNum", "Programa", "Region", "CanalDominante", "Disciplina"]
+MEDIDAS = ["Estudiantes", "IngresosMXN", "Colocados",
+           "Est_Debito", "Est_Credito", "Est_Transfer", "Est_PayPal"]
+
+
+def construir_cubo(d):
+    """Agrega la base derivada ``d`` (ver ``Est_*``/``IngresosMXN``) por DIMS."""
+    return (d.groupby(DIMS, sort=False, observed=True, dropna=False)[MEDIDAS]
+             .sum()
+             .reset_index())
+
+
+def rebanar(cubo, **filtros):
+    """Celdas del cubo que cumplen ``columna=valor`` o ``columna=[valores]``."""
+    mask = pd.Series(True, index=cubo.index)
+    for col, val in filtros.items():
+        if isinstance(val, (list, tuple, set)):
+            mask &= cubo[col].isin(list(val))
+        else:
+            mask &= cubo[col] == val
+    return cubo[mask]
+
+
+def rollup(cubo, por, medidas=("Estudiantes",)):
+    """Suma ``medidas`` por las dimensiones ``por`` (ordenado por clave)."""
+    por = [por] if isinstance(por, str) else list(por)
+    return cubo.groupby(por, observed=True)[list(medidas)].sum().reset_index()
+
+
+def totales(cubo, medidas=MEDIDAS):
+    """Suma de cada medida sobre todo el cubo (o una rebanada)."""
+    return cubo[list(medidas)].sum()
+
+
+def lider(cubo, dim, medida="Estudiantes"):
+    """Valor de ``dim`` con mayor ``medida`` (None si la rebanada está vacía)."""
+    s = cubo.groupby(dim, observed=True)[medida].sum()
+    return s.idxmax() if len(s) else None
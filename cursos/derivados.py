@@ -0,0 +1,51 @@
+# cursos/derivados.py
+"""Columnas derivadas de la tabla de ediciones (pagos normalizados, ingresos, Est_*)."""
+import numpy as np
+import pandas as pd
+
+from cursos.esquema import ENTEROS
+from cursos.ingresos import ingresos_mxn
+from cursos.perf import etapa
+
+PCT_COLS = ["PctDebito","PctCredito","PctTransfer","PctPayPal"]
+PCT_DEFAULT = np.array([40, 20, 30, 10], dtype=float)
+
+
+def normalize_pcts(p):
+    """Normaliza en bloque una matriz (n, 4) de porcentajes de pago.
+
+    Vacíos/NaN -> 0, limita a [0,100] y reescala cada fila a 100 con enteros;
+    las filas que suman 0 usan 40/20/30/10. El redondeo se ajusta en la 1a columna.
+    """
+    p = np.clip(np.nan_to_num(np.asarray(p, dtype=float).reshape(-1, 4), nan=0.0), 0.0, 100.0)
+    s = p.sum(axis=1, keepdims=True)
+    vacias = (s <= 0).ravel()
+    p[vacias] = PCT_DEFAULT
+    s[vacias] = 100.0
+
+    r = np.round(p / s * 100.0).astype(int)
+    # Ajuste final para que sume 100
+    r[:, 0] += 100 - r.sum(axis=1)
+    return np.clip(r, 0, 100)
+
+
+def derivar(base):
+    """Copia de ``base`` con PctXxxN, IngresosMXN y Est_* (robusta a NaN/strings)."""
+    d = base.copy()
+    # Tipos seguros básicos
+    for c in ["Estudiantes","Colocados"] + PCT_COLS:
+        d[c] = pd.to_numeric(d[c], errors="coerce").fillna(0).astype(ENTEROS[c])
+
+    # Porcentajes normalizados por fila (N = normalizado)
+    with etapa("normalize_pcts"):
+        pcts = normalize_pcts(d[PCT_COLS].to_numpy(dtype=float))
+    d[[c+"N" for c in PCT_COLS]] = pcts.astype("int8")
+
+    # Ingresos estimados (numérico seguro)
+    with etapa("ingresos_mxn"):
+        d["IngresosMXN"] = ingresos_mxn(d)
+
+    # Estudiantes por método de pago
+    est = d["Estudiantes"].to_numpy()[:, None]
+    d[["Est_Debito","Est_Credito","Est_Transfer","Est_PayPal"]] = np.round(est * pcts / 100.0).astype("int32")
+    return d
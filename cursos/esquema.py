@@ -0,0 +1,56 @@
+# cursos/esquema.py
+"""Esquema compacto de la tabla de ediciones.
+
+Las columnas de texto con catálogo se guardan como categóricas con categorías
+fijas (orden alfabético, igual al que daba el groupby sobre strings; los meses
+en orden de calendario) y los enteros pequeños con el dtype más chico que
+alcanza. ``isin``/``groupby`` trabajan así sobre códigos y no sobre strings.
+"""
+import pandas as pd
+
+from cursos.catalogos import PROGRAMAS, REGIONES, CANALES, DISCIP, MONTHS
+
+COLS = ["FechaInicio","Año","MesNum","Mes","Programa","Modalidad","UnidadPrecio","PrecioUnidadMXN",
+        "DuraciónMeses","DuraciónSemanas","Estudiantes","CanalDominante","Region","Disciplina","Edición",
+        "PctDebito","PctCredito","PctTransfer","PctPayPal","Colocados"]
+
+CATEGORIAS = {
+    "Programa": pd.CategoricalDtype(sorted(p[0] for p in PROGRAMAS)),
+    "Modalidad": pd.CategoricalDtype(sorted({p[1] for p in PROGRAMAS})),
+    "UnidadPrecio": pd.CategoricalDtype(["MES", "SEM"]),
+    "CanalDominante": pd.CategoricalDtype(sorted(CANALES)),
+    "Region": pd.CategoricalDtype(sorted(REGIONES)),
+    "Disciplina": pd.CategoricalDtype(sorted(DISCIP)),
+    "Mes": pd.CategoricalDtype(MONTHS, ordered=True),
+}
+ENTEROS = {
+    "Año": "int16", "MesNum": "int8", "PrecioUnidadMXN": "int32", "Estudiantes": "int32",
+    "PctDebito": "int8", "PctCredito": "int8", "PctTransfer": "int8", "PctPayPal": "int8",
+    "Colocados": "int32",
+}
+# Duraciones: NaN cuando no aplica la unidad
+FLOTANTES = {"DuraciónMeses": "float32", "DuraciónSemanas": "float32"}
+# Texto libre: siempre el dtype ``str`` de pandas (>= 3), venga de Parquet, la bitácora o una importación
+TEXTO = {"Edición": "str"}
+
+
+def aplicar_esquema(df):
+    """Copia de ``df`` con los dtypes compactos.
+
+    Valores fuera de catálogo quedan como NaN en las categóricas; la
+    validación de entrada debe rechazarlos antes de llegar aquí.
+    """
+    out = df.copy()
+    for c, dtype in CATEGORIAS.items():
+        if c in out and out[c].dtype != dtype:
+            out[c] = out[c].astype(dtype)
+    for c, dtype in ENTEROS.items():
+        if c in out and out[c].dtype != dtype:
+            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0).round().astype(dtype)
+    for c, dtype in FLOTANTES.items():
+        if c in out and out[c].dtype != dtype:
+            out[c] = pd.to_numeric(out[c], errors="coerce").astype(dtype)
+    for c, dtype in TEXTO.items():
+        if c in out and out[c].dtype != dtype:
+            out[c] = out[c].astype(dtype)
+    return out
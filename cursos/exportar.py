@@ -0,0 +1,63 @@
+# cursos/exportar.py
+"""Exportación por lotes a CSV, CSV comprimido (gzip) y Parquet.
+
+El frame se escribe de a ``lote`` filas directo al destino, así nunca existe
+el texto completo del CSV además del archivo final. En la app se usa detrás
+de ``st.download_button(data=callable)``: solo corre al hacer clic.
+"""
+import gzip
+import io
+
+from cursos.perf import etapa
+
+LOTE = 100_000
+# formato -> (etiqueta, mime, extensión)
+FORMATOS = {
+    "csv": ("CSV", "text/csv", ".csv"),
+    "csv.gz": ("CSV (gzip)", "application/gzip", ".csv.gz"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def _csv(df, destino, lote):
+    texto = io.TextIOWrapper(destino, encoding="utf-8", newline="", write_through=True)
+    for i in range(0, max(len(df), 1), lote):
+        df.iloc[i:i + lote].to_csv(texto, index=False, header=i == 0)
+    texto.detach()  # deja abierto ``destino``
+
+
+def _parquet(df, destino, lote):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    escritor = None
+    try:
+        for i in range(0, max(len(df), 1), lote):
+            tabla = pa.Table.from_pandas(df.iloc[i:i + lote], preserve_index=False)
+            if escritor is None:
+                escritor = pq.ParquetWriter(destino, tabla.schema)
+            escritor.write_table(tabla.cast(escritor.schema))
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+def exportar(df, formato="csv", destino=None, lote=LOTE):
+    """Escribe ``df`` en ``formato`` (ver FORMATOS) a ``destino`` (binario).
+
+    Sin ``destino`` se usa un BytesIO, que se devuelve rebobinado.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    destino = io.BytesIO() if destino is None else destino
+    with etapa(f"exportar:{formato}"):
+        if formato == "parquet":
+            _parquet(df, destino, lote)
+        elif formato == "csv.gz":
+            with gzip.GzipFile(fileobj=destino, mode="wb", compresslevel=6) as gz:
+                _csv(df, gz, lote)
+        else:
+            _csv(df, destino, lote)
+    if isinstance(destino, io.BytesIO):
+        destino.seek(0)
+    return destino
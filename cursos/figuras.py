@@ -0,0 +1,180 @@
+# cursos/figuras.py
+"""Figuras Plotly de cada pestaña, armadas desde una rebanada del cubo.
+
+Cada función recibe la rebanada ``q`` (ver ``cubo.rebanar``) y la plantilla
+Plotly, y devuelve la figura lista para ``st.plotly_chart``. Plotly Express
+se importa dentro de cada función, con el primer gráfico: no retrasa el
+arranque ni el pintado de la barra lateral y los KPIs.
+"""
+import numpy as np
+import pandas as pd
+
+from cursos.catalogos import MONTHS
+from cursos.cubo import rollup, totales
+from cursos.perf import medido
+
+PALETTE = ["#1e88e5","#43a047","#fb8c00","#8e24aa","#00acc1","#ef5350","#3949ab","#00897b"]
+
+
+def px_template(theme_choice: str):
+    return "plotly_dark" if theme_choice == "Oscuro" else "plotly_white"
+
+
+def con_mes(t):
+    # Etiqueta de mes a partir de MesNum (el cubo solo guarda MesNum); si ``t`` trae
+    # Año la etiqueta lo lleva ("Ene 2024"), para no juntar meses de años distintos
+    mes = np.array(MONTHS, dtype=object)[t["MesNum"].to_numpy(dtype=int) - 1]
+    if "Año" in t:
+        mes = mes + " " + t["Año"].astype(str).to_numpy(dtype=object)
+    return t.assign(Mes=mes)
+
+
+def por_mes(q, por=(), medidas=("Estudiantes",)):
+    """Rollup mensual de ``q`` en orden cronológico; por año y mes si abarca varios años."""
+    anios = ["Año"] if q["Año"].nunique() > 1 else []
+    return con_mes(rollup(q, [*anios, "MesNum", *por], medidas))
+
+
+def meses(q):
+    # Columnas mensuales del periodo de ``q`` (las 12 de cada año)
+    anios = sorted(q["Año"].unique())
+    return list(MONTHS) if len(anios) <= 1 else [f"{m} {a}" for a in anios for m in MONTHS]
+
+
+@medido("fig:mes_programa")
+def mes_programa(q, tpl):
+    import plotly.express as px
+
+    A = por_mes(q, ["Programa"])
+    fig = px.bar(A, x="Mes", y="Estudiantes", color="Programa", barmode="group",
+                 template=tpl, color_discrete_sequence=PALETTE, text_auto=True,
+                 hover_data={"Mes":True,"Programa":True,"Estudiantes":":,"})
+    fig.update_layout(height=360, margin=dict(t=40,b=10,l=10,r=10), legend_title_text="Programa")
+    return fig
+
+
+@medido("fig:tendencia")
+def tendencia(q, tpl):
+    import plotly.express as px
+
+    B = por_mes(q)
+    fig = px.line(B, x="Mes", y="Estudiantes", markers=True, template=tpl)
+    fig.update_traces(hovertemplate="Mes: %{x}<br>Estudiantes: %{y:,}")
+    fig.update_layout(height=360, margin=dict(t=40,b=10,l=10,r=10))
+    return fig
+
+
+@medido("fig:ingresos")
+def ingresos(q, tpl):
+    import plotly.express as px
+
+    R = por_mes(q, ["Programa"], ["IngresosMXN"])
+    fig = px.area(R, x="Mes", y="IngresosMXN", color="Programa",
+                  template=tpl, color_discrete_sequence=PALETTE)
+    fig.update_traces(hovertemplate="Mes: %{x}<br>%{legendgroup}: $%{y:,.0f} MXN")
+    fig.update_layout(height=360, margin=dict(t=40,b=10,l=10,r=10), yaxis_title="MXN", legend_title_text="Programa")
+    return fig
+
+
+@medido("fig:regiones")
+def regiones(q, tpl):
+    import plotly.express as px
+
+    G = rollup(q, "Region").rename(columns={"Estudiantes":"TotalEstudiantes"}).sort_values("TotalEstudiantes")
+    fig = px.bar(G, x="TotalEstudiantes", y="Region", orientation="h",
+                 template=tpl, color_discrete_sequence=PALETTE, text="TotalEstudiantes")
+    fig.update_traces(texttemplate="%{text:,}", hovertemplate="%{y}<br>Estudiantes: %{x:,}")
+    fig.update_layout(height=max(260, 28*len(G)), margin=dict(t=30,b=10,l=10,r=10))
+    return fig
+
+
+@medido("fig:canales")
+def canales(q, tpl):
+    import plotly.express as px
+
+    C = rollup(q, "CanalDominante").rename(columns={"Estudiantes":"TotalEstudiantes"})
+    fig = px.bar(C, x="CanalDominante", y="TotalEstudiantes",
+                 template=tpl, color_discrete_sequence=PALETTE, text="TotalEstudiantes")
+    fig.update_traces(texttemplate="%{text:,}", hovertemplate="%{x}<br>Estudiantes: %{y:,}")
+    fig.update_layout(height=320, margin=dict(t=30,b=10,l=10,r=10), xaxis_title="Canal", yaxis_title="Estudiantes")
+    return fig
+
+
+@medido("fig:pagos")
+def pagos(q, tpl):
+    import plotly.express as px
+
+    # Mezcla de pagos (por estudiantes)
+    tot = totales(q)
+    P = pd.DataFrame({
+        "Método": ["Débito","Crédito","Transferencia","PayPal"],
+        "Estudiantes": [
+            int(tot["Est_Debito"]),
+            int(tot["Est_Credito"]),
+            int(tot["Est_Transfer"]),
+            int(tot["Est_PayPal"]),
+        ]
+    })
+    fig = px.pie(P, names="Método", values="Estudiantes", template=tpl, hole=0.45)
+    fig.update_traces(textinfo="percent+label", hovertemplate="%{label}: %{value:,} estudiantes")
+    fig.update_layout(height=360, margin=dict(t=30,b=10,l=10,r=10))
+    return fig
+
+
+@medido("fig:empleabilidad")
+def empleabilidad(q, tpl):
+    import plotly.express as px
+
+    # Colocación por programa
+    emp = rollup(q, "Programa", ["Estudiantes","Colocados"])
+    emp["Tasa"] = np.where(emp["Estudiantes"]>0, emp["Colocados"]/emp["Estudiantes"]*100, 0)
+    fig = px.bar(emp.sort_values("Tasa"), x="Tasa", y="Programa", orientation="h",
+                 template=tpl, color_discrete_sequence=PALETTE, text=emp["Tasa"].map(lambda x:f"{x:.1f}%"))
+    fig.update_traces(
+        hovertemplate="%{y}<br>Tasa: %{x:.1f}%<br>Colocados: %{customdata[0]:,} / %{customdata[1]:,}",
+        customdata=np.stack([emp["Colocados"], emp["Estudiantes"]], axis=1)
+    )
+    fig.update_layout(height=max(260, 30*len(emp)), margin=dict(t=30,b=10,l=10,r=10), xaxis_title="Tasa de colocación (%)")
+    return fig
+
+
+@medido("fig:heatmap")
+def heatmap(q, tpl):
+    import plotly.graph_objects as go
+
+    H = por_mes(q, ["Programa"])
+    pivot = H.pivot_table(index="Programa", columns="Mes", values="Estudiantes", aggfunc="sum", observed=True).reindex(columns=meses(q)).fillna(0)
+    fig = go.Figure(data=go.Heatmap(
+        z=pivot.values, x=pivot.columns, y=pivot.index,
+        colorscale="Blues", hovertemplate="Programa: %{y}<br>Mes: %{x}<br>Estudiantes: %{z}<extra></extra>",
+        colorbar=dict(title="Estudiantes")
+    ))
+    fig.update_layout(template=tpl, height=max(260, 28*len(pivot.index)), margin=dict(t=40,b=10,l=10,r=10))
+    return fig
+
+
+@medido("fig:proyeccion")
+def proyeccion(bandas, medida, tpl):
+    import plotly.express as px
+
+    # P50 por programa con barras de error hasta P10 / P90 (ver proyecciones.simular)
+    P = bandas[(bandas["Medida"] == medida) & (bandas["Programa"] != "Total")]
+    fig = px.bar(P, x="Programa", y="P50", template=tpl, color_discrete_sequence=PALETTE,
+                 error_y=P["P90"] - P["P50"], error_y_minus=P["P50"] - P["P10"])
+    fig.update_traces(customdata=P[["P10","P90"]].to_numpy(),
+                      hovertemplate="%{x}<br>P50: %{y:,.0f}<br>P10–P90: %{customdata[0]:,.0f} – %{customdata[1]:,.0f}<extra></extra>")
+    fig.update_layout(height=380, margin=dict(t=30,b=10,l=10,r=10), yaxis_title=medida, xaxis_title=None)
+    return fig
+
+
+# Todas las figuras del dashboard por nombre (orden de las pestañas)
+FIGURAS = {
+    "mes_programa": mes_programa,
+    "tendencia": tendencia,
+    "ingresos": ingresos,
+    "regiones": regiones,
+    "canales": canales,
+    "pagos": pagos,
+    "empleabilidad": empleabilidad,
+    "heatmap": heatmap,
+}
@@ -0,0 +1,63 @@
+# cursos/grilla.py
+"""Grilla paginada del lado del servidor.
+
+Búsqueda y orden trabajan sobre posiciones (arrays de enteros) del frame ya
+cacheado: la búsqueda en categóricas se hace sobre sus categorías (pocas) y se
+proyecta por códigos; el orden usa ``np.lexsort`` sobre códigos/valores. Al
+navegador solo viaja la página visible.
+"""
+import numpy as np
+import pandas as pd
+
+POR_PAGINA = 200
+
+
+def buscar(df, texto, columnas=None):
+    """Posiciones de las filas donde alguna columna de texto contiene ``texto`` (sin mayúsculas)."""
+    t = texto.strip().lower()
+    if not t:
+        return np.arange(len(df))
+    mask = np.zeros(len(df), dtype=bool)
+    for c in (df.columns if columnas is None else columnas):
+        s = df[c]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # Código -1 (NaN) cae en el último elemento: nunca coincide
+            hit = np.append([t in str(v).lower() for v in s.cat.categories], False)
+            if hit.any():
+                mask |= hit[s.cat.codes.to_numpy()]
+        elif pd.api.types.is_string_dtype(s):
+            mask |= s.str.contains(t, case=False, regex=False, na=False).to_numpy(dtype=bool)
+    return np.flatnonzero(mask)
+
+
+def _clave(s):
+    # Valores ordenables por lexsort: códigos para categóricas/texto, valores para números
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy()
+    if pd.api.types.is_numeric_dtype(s):
+        return s.to_numpy()
+    return pd.factorize(s, sort=True)[0]
+
+
+def ordenar(df, por, ascendente=True, filas=None):
+    """``filas`` (posiciones; por defecto todas) ordenadas por las columnas ``por`` (estable)."""
+    filas = np.arange(len(df)) if filas is None else np.asarray(filas)
+    if not por or not len(filas):
+        return filas
+    # lexsort: la última clave es la primaria
+    claves = [_clave(df[c])[filas] for c in reversed(por)]
+    if not ascendente:
+        claves = [-k.astype(np.float64) for k in claves]
+    return filas[np.lexsort(claves)]
+
+
+def paginas(n, por_pagina=POR_PAGINA):
+    return max(1, -(-n // por_pagina))
+
+
+def pagina(df, filas, numero, por_pagina=POR_PAGINA, columnas=None):
+    """Página ``numero`` (desde 1) de ``df`` según las posiciones ``filas``."""
+    numero = min(max(1, numero), paginas(len(filas), por_pagina))
+    sel = filas[(numero - 1) * por_pagina: numero * por_pagina]
+    out = df.iloc[sel]
+    return out[columnas] if columnas is not None else out
@@ -0,0 +1,47 @@
+# cursos/indice.py
+"""Índice de bitmaps para los filtros de la barra lateral.
+
+Por cada valor distinto de las columnas filtrables se guarda un bitmap
+empaquetado (``np.packbits``, n/8 bytes) con las filas que lo tienen. Un
+filtro es entonces un OR de los bitmaps de los valores elegidos por columna,
+un AND entre columnas y un solo ``take`` al final; las columnas con todos sus
+valores elegidos no se tocan. Se construye una vez por versión de datos.
+"""
+import numpy as np
+import pandas as pd
+
+COLS_INDICE = ["Año", "Programa", "CanalDominante", "Region", "Disciplina"]
+
+
+class IndiceFiltros:
+
+    def __init__(self, d, columnas=COLS_INDICE):
+        self.n = len(d)
+        self.mapas = {}
+        # Columnas sin nulos: elegir todos sus valores equivale a no filtrar
+        self._completas = set()
+        for c in columnas:
+            s = d[c]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                codigos, valores = s.cat.codes.to_numpy(), list(s.cat.categories)
+            else:
+                codigos, valores = pd.factorize(s, sort=True)
+                valores = list(valores)
+            self.mapas[c] = {v: np.packbits(codigos == i) for i, v in enumerate(valores)}
+            if not (codigos < 0).any():
+                self._completas.add(c)
+
+    def filas(self, **filtros):
+        """Posiciones (ordenadas) de las filas con ``columna`` en los valores dados."""
+        acc = None
+        for c, valores in filtros.items():
+            mapas = self.mapas[c]
+            valores = set(valores)
+            if c in self._completas and valores.issuperset(mapas):
+                continue
+            sel = [mapas[v] for v in valores if v in mapas]
+            m = np.bitwise_or.reduce(sel) if sel else np.zeros((self.n + 7) // 8, dtype=np.uint8)
+            acc = m if acc is None else np.bitwise_and(acc, m, out=acc)
+        if acc is None:
+            return np.arange(self.n)
+        return np.flatnonzero(np.unpackbits(acc, count=self.n))
@@ -0,0 +1,266 @@
+# cursos/ingesta.py
+"""Ingesta por lotes de ediciones reales (CSV o Parquet).
+
+El archivo se lee en lotes de ``lote`` filas (``read_csv(chunksize=...)`` o
+``ParquetFile.iter_batches``), cada lote se mapea al esquema de COLS, se valida
+y se convierte a tipos compactos. El archivo crudo nunca está completo en
+memoria.
+
+Uso desde línea de comandos::
+
+    python -m cursos.ingesta export.csv [--salida data/ediciones.parquet] [--agregar]
+
+Si la app está corriendo sobre ese mismo archivo, ``Almacen`` detecta el cambio
+en el siguiente rerun y rechaza publicar ediciones hechas sobre la versión
+anterior.
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cursos.almacen import RUTA_DEFAULT
+from cursos.catalogos import PROGRAMAS, REGIONES, CANALES, DISCIP, MONTHS
+from cursos.derivados import PCT_COLS, normalize_pcts
+from cursos.esquema import COLS, aplicar_esquema
+
+LOTE_DEFAULT = 100_000
+PROG_MAP = {p[0]: p for p in PROGRAMAS}
+CATALOGOS = {"Programa": set(PROG_MAP), "CanalDominante": set(CANALES),
+             "Region": set(REGIONES), "Disciplina": set(DISCIP)}
+# Columnas del programa: posición en PROGRAMAS. Las de texto deben coincidir con el
+# catálogo; las numéricas pueden venir en el archivo y, si faltan, salen del catálogo.
+DEL_PROGRAMA = {"Modalidad": 1, "UnidadPrecio": 2}
+NUM_PROGRAMA = {"PrecioUnidadMXN": 3, "DuraciónMeses": 4, "DuraciónSemanas": 5}
+INT32_MAX = np.iinfo(np.int32).max
+
+
+@dataclass
+class Reporte:
+    filas: int = 0
+    validas: int = 0
+    rechazadas: int = 0
+    segundos: float = 0.0
+    motivos: dict = field(default_factory=dict)
+
+    @property
+    def filas_por_seg(self):
+        return self.filas / self.segundos if self.segundos > 0 else 0.0
+
+    def __str__(self):
+        txt = (f"{self.filas:,} filas · {self.validas:,} válidas · {self.rechazadas:,} rechazadas · "
+               f"{self.segundos:.2f}s ({self.filas_por_seg:,.0f} filas/s)")
+        for motivo, n in sorted(self.motivos.items(), key=lambda kv: -kv[1]):
+            txt += f"\n  - {motivo}: {n:,}"
+        return txt
+
+
+def _formato(fuente, formato):
+    if formato:
+        return formato
+    nombre = str(getattr(fuente, "name", fuente)).lower()
+    return "parquet" if nombre.endswith((".parquet", ".pq")) else "csv"
+
+
+def leer_por_lotes(fuente, formato=None, lote=LOTE_DEFAULT):
+    """Genera DataFrames de a lo más ``lote`` filas desde una ruta o archivo abierto."""
+    if _formato(fuente, formato) == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(fuente).iter_batches(batch_size=lote):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(fuente, chunksize=lote)
+
+
+def validar_lote(lote, renombrar=None):
+    """Mapea un lote crudo a COLS.
+
+    Devuelve ``(validas, motivo)``: las filas válidas con tipos compactos y una
+    Serie con el motivo de rechazo por fila (NaN si la fila es válida).
+    """
+    x = lote.rename(columns=renombrar or {}).reset_index(drop=True)
+    motivo = pd.Series(np.nan, index=x.index, dtype=object)
+
+    def rechazar(mask, txt):
+        motivo[mask & motivo.isna()] = txt
+
+    def col(c):
+        return x[c] if c in x else pd.Series(np.nan, index=x.index)
+
+    # Catálogos
+    for c, valores in CATALOGOS.items():
+        if c not in x:
+            rechazar(pd.Series(True, index=x.index), f"falta columna {c}")
+            x[c] = np.nan
+        x[c] = x[c].astype("string").str.strip()
+        rechazar(~x[c].isin(valores).fillna(False).astype(bool), f"{c} fuera de catálogo")
+
+    # Año / MesNum: columnas directas, o desde Mes / FechaInicio
+    fecha = pd.to_datetime(col("FechaInicio"), errors="coerce")
+    anio = pd.to_numeric(col("Año"), errors="coerce").fillna(fecha.dt.year)
+    mes_txt = col("Mes").map({m: i + 1 for i, m in enumerate(MONTHS)})
+    mes = pd.to_numeric(col("MesNum"), errors="coerce").fillna(mes_txt).fillna(fecha.dt.month)
+    rechazar(anio.isna() | (anio < 1900) | (anio > 2100) | (anio % 1 != 0), "Año inválido")
+    rechazar(mes.isna() | ~mes.between(1, 12) | (mes % 1 != 0), "Mes inválido")
+
+    est = pd.to_numeric(col("Estudiantes"), errors="coerce")
+    rechazar(est.isna() | (est < 0) | (est > INT32_MAX), "Estudiantes inválido")
+
+    # Modalidad / unidad de precio del archivo: las del catálogo de su programa
+    for c, i in DEL_PROGRAMA.items():
+        if c in x:
+            cat = x["Programa"].map({k: p[i] for k, p in PROG_MAP.items()})
+            dato = x[c].astype("string").str.strip()
+            rechazar((dato.notna() & (dato != cat)).fillna(True).astype(bool), f"{c} no coincide con el programa")
+    numeros = {}
+    for c in NUM_PROGRAMA:
+        numeros[c] = pd.to_numeric(col(c), errors="coerce")
+        tope = INT32_MAX if c == "PrecioUnidadMXN" else np.inf
+        rechazar(col(c).notna() & (numeros[c].isna() | (numeros[c] < 0) | (numeros[c] > tope)), f"{c} inválido")
+    pcts = {}
+    for c in PCT_COLS:
+        pcts[c] = pd.to_numeric(col(c), errors="coerce")
+        rechazar(col(c).notna() & (pcts[c].isna() | ~pcts[c].between(0, 100)), f"{c} fuera de 0..100")
+
+    ok = motivo.isna().to_numpy()
+    v = x.loc[ok].reset_index(drop=True)
+    anio, mes, est = (s[ok].astype(int).reset_index(drop=True) for s in (anio, mes, est))
+    v["Año"], v["MesNum"], v["Estudiantes"] = anio, mes, est
+    v["Mes"] = np.array(MONTHS, dtype=object)[mes.to_numpy() - 1]
+    # Una fecha por (año, mes) distinto, no una por fila
+    ym = anio * 100 + mes
+    v["FechaInicio"] = ym.map({k: date(k // 100, k % 100, 1) for k in ym.unique()}).astype(object)
+
+    # Datos del programa desde el catálogo (los numéricos solo cuando no vienen en el archivo)
+    for c, i in DEL_PROGRAMA.items():
+        v[c] = v["Programa"].map({k: p[i] for k, p in PROG_MAP.items()}).astype(object)
+    for c, i in NUM_PROGRAMA.items():
+        cat = v["Programa"].map({k: p[i] for k, p in PROG_MAP.items()}).astype(float)
+        dato = numeros[c][ok].reset_index(drop=True)
+        v[c] = dato.where(dato.notna(), cat)
+
+    if "Edición" not in v:
+        v["Edición"] = np.nan
+    gen = v["Programa"].str[:3].str.upper() + "-" + anio.astype(str) + "-" + mes.astype(str)
+    v["Edición"] = v["Edición"].fillna(gen).astype("str")
+
+    # Pagos: ya validados en [0,100]; se llevan a suma 100, sin datos -> 40/20/30/10
+    v[PCT_COLS] = normalize_pcts(np.column_stack([pcts[c].to_numpy(dtype=float)[ok] for c in PCT_COLS]))
+
+    v["Colocados"] = np.minimum(pd.to_numeric(col("Colocados")[ok], errors="coerce").fillna(0).clip(lower=0).to_numpy(),
+                                v["Estudiantes"].to_numpy())
+    return aplicar_esquema(v[COLS]), motivo
+
+
+def ingerir(fuente, formato=None, lote=LOTE_DEFAULT, renombrar=None, claves=None, rechazos=None):
+    """Itera ``(validas, reporte)`` lote por lote.
+
+    ``claves`` es el conjunto de Ediciones ya existentes (para rechazar
+    duplicados, también dentro del archivo). ``rechazos`` es una ruta CSV
+    opcional donde se agregan las filas rechazadas con su motivo.
+    """
+    rep = Reporte()
+    claves = set() if claves is None else set(claves)
+    t0 = time.perf_counter()
+    primera = True
+    for crudo in leer_por_lotes(fuente, formato, lote):
+        validas, motivo = validar_lote(crudo, renombrar)
+
+        # Membresía contra el set acumulado: O(lote), no O(claves) como isin
+        ediciones = validas["Edición"].to_numpy(dtype=object)
+        dup = validas["Edición"].duplicated().to_numpy() \
+            | np.fromiter((e in claves for e in ediciones), dtype=bool, count=len(ediciones))
+        if dup.any():
+            idx_ok = motivo.index[motivo.isna()]
+            motivo[idx_ok[dup]] = "Edición duplicada"
+            validas = validas[~dup].reset_index(drop=True)
+            ediciones = ediciones[~dup]
+        claves.update(ediciones)
+
+        malas = motivo.notna()
+        rep.filas += len(crudo)
+        rep.validas += len(validas)
+        rep.rechazadas += int(malas.sum())
+        for m, k in motivo[malas].value_counts().items():
+            rep.motivos[m] = rep.motivos.get(m, 0) + int(k)
+        if rechazos is not None and malas.any():
+            crudo.reset_index(drop=True)[malas.to_numpy()].assign(Motivo=motivo[malas].to_numpy()) \
+                .to_csv(rechazos, mode="w" if primera else "a", header=primera, index=False)
+            primera = False
+        rep.segundos = time.perf_counter() - t0
+        yield validas, rep
+
+
+def ingerir_frame(fuente, **kw):
+    """Ingesta completa a un DataFrame compacto (solo filas válidas) + Reporte."""
+    partes, rep = [], Reporte()
+    for validas, rep in ingerir(fuente, **kw):
+        partes.append(validas)
+    base = pd.concat(partes, ignore_index=True) if partes else aplicar_esquema(pd.DataFrame(columns=COLS))
+    return base, rep
+
+
+def ingerir_a_parquet(fuente, salida=RUTA_DEFAULT, agregar=False, **kw):
+    """Escribe las filas válidas a ``salida`` lote por lote (sin juntar todo en memoria)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    salida = Path(salida)
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    tmp = salida.with_suffix(salida.suffix + ".tmp")
+    escritor, rep = None, Reporte()
+
+    def escribir(df):
+        nonlocal escritor
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        if escritor is None:
+            escritor = pq.ParquetWriter(tmp, tabla.schema)
+        escritor.write_table(tabla.cast(escritor.schema))
+
+    claves = set()
+    try:
+        if agregar and salida.exists():
+            for batch in pq.ParquetFile(salida).iter_batches(batch_size=LOTE_DEFAULT):
+                previo = aplicar_esquema(batch.to_pandas())
+                claves.update(previo["Edición"])
+                escribir(previo)
+        for validas, rep in ingerir(fuente, claves=claves, **kw):
+            if len(validas):
+                escribir(validas)
+        if escritor is None:
+            escribir(aplicar_esquema(pd.DataFrame(columns=COLS)))
+    finally:
+        if escritor is not None:
+            escritor.close()
+    os.replace(tmp, salida)
+    return rep
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cursos.ingesta", description=__doc__.split("\n\n")[0])
+    ap.add_argument("archivo", help="CSV o Parquet con ediciones")
+    ap.add_argument("--salida", default=str(RUTA_DEFAULT), help="Parquet destino (default: %(default)s)")
+    ap.add_argument("--agregar", action="store_true", help="agrega a la base existente en vez de reemplazarla")
+    ap.add_argument("--formato", choices=["csv", "parquet"], help="por defecto se infiere de la extensión")
+    ap.add_argument("--lote", type=int, default=LOTE_DEFAULT, help="filas por lote (default: %(default)s)")
+    ap.add_argument("--col", action="append", default=[], metavar="ORIGEN=DESTINO",
+                    help="renombra una columna del archivo a una de COLS (repetible)")
+    ap.add_argument("--rechazos", help="CSV donde guardar las filas rechazadas con su motivo")
+    args = ap.parse_args(argv)
+
+    renombrar = dict(c.split("=", 1) for c in args.col)
+    rep = ingerir_a_parquet(args.archivo, args.salida, agregar=args.agregar, formato=args.formato,
+                            lote=args.lote, renombrar=renombrar, rechazos=args.rechazos)
+    print(rep)
+    return 0 if rep.validas else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# cursos/ingresos.py
+"""Motor de ingresos columnar.
+
+IngresosMXN = precio por unidad × unidades (meses o semanas) × estudiantes,
+calculado como una sola expresión sobre columnas. Las reglas de precio son
+callables vectorizados ``regla(df, precio) -> precio`` que se aplican en orden.
+"""
+import numpy as np
+import pandas as pd
+
+MESES_DEFAULT = 6
+SEMANAS_DEFAULT = 8
+
+
+def _num(df, col):
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+
+def ingresos_mxn(df, reglas=()):
+    """Serie IngresosMXN (float, sin NaN/inf) alineada con ``df.index``."""
+    precio = _num(df, "PrecioUnidadMXN")
+    for regla in reglas:
+        precio = np.asarray(regla(df, precio), dtype=float)
+
+    # int(...) de la versión por fila: trunca duraciones, con 6 meses / 8 semanas por defecto
+    meses = np.trunc(np.nan_to_num(_num(df, "DuraciónMeses"), nan=MESES_DEFAULT))
+    semanas = np.trunc(np.nan_to_num(_num(df, "DuraciónSemanas"), nan=SEMANAS_DEFAULT))
+    unidades = np.where(df["UnidadPrecio"].to_numpy() == "MES", meses, semanas)
+
+    ing = precio * unidades * _num(df, "Estudiantes")
+    ing[~np.isfinite(ing)] = 0.0
+    return pd.Series(ing, index=df.index, name="IngresosMXN")
+
+
+# ---------- Reglas de precio ----------
+def lista_precios(precios, clave=("Programa", "Region")):
+    """Sustituye el precio por unidad según una lista de precios.
+
+    ``precios`` mapea el valor de ``clave`` (una columna o tupla de columnas)
+    al nuevo precio; las filas sin entrada conservan su precio.
+    """
+    clave = [clave] if isinstance(clave, str) else list(clave)
+    tabla = pd.Series(
+        list(precios.values()),
+        index=pd.MultiIndex.from_tuples([k if isinstance(k, tuple) else (k,) for k in precios], names=clave),
+        dtype=float,
+    )
+
+    def regla(df, precio):
+        nuevo = tabla.reindex(pd.MultiIndex.from_frame(df[clave])).to_numpy()
+        return np.where(np.isnan(nuevo), precio, nuevo)
+
+    return regla
+
+
+def descuento(pct, **filtros):
+    """Aplica ``pct``% de descuento a las filas que cumplen todos los filtros.
+
+    Cada filtro es ``columna=valor`` o ``columna=[valores]``; sin filtros aplica a todo.
+    """
+    factor = 1.0 - pct / 100.0
+
+    def regla(df, precio):
+        mask = np.ones(len(df), dtype=bool)
+        for col, val in filtros.items():
+            vals = val if isinstance(val, (list, tuple, set)) else [val]
+            mask &= df[col].isin(vals).to_numpy()
+        return np.where(mask, precio * factor, precio)
+
+    return regla
@@ -0,0 +1,100 @@
+# cursos/motor.py
+"""Motores de filtro y agregación.
+
+Un motor se construye una vez por versión de datos a partir de la base y
+expone la base derivada ``d``, el cubo ``cubo``, ``seleccionar(*filtros) ->
+(posiciones, q)`` y ``filtrar(*filtros) -> (f, q)``. ``MotorPandas`` (por defecto) agrega con groupby y filtra con el
+índice de bitmaps. ``MotorDuckDB`` (opcional, ``pip install duckdb``) arma el
+cubo y resuelve las filas con SQL multihilo sobre el frame derivado (sin
+copiarlo); devuelve exactamente los mismos frames. El motor se comparte
+entre sesiones: cada consulta usa su propio cursor, porque una conexión de
+DuckDB no es segura entre hilos. Se elige con
+``CURSOS_MOTOR=pandas|duckdb``.
+"""
+import os
+
+import numpy as np
+
+from cursos.cubo import DIMS, MEDIDAS, construir_cubo, rebanar
+from cursos.derivados import derivar
+from cursos.indice import IndiceFiltros
+from cursos.perf import etapa
+
+FILTROS = ["Año", "Programa", "CanalDominante", "Region", "Disciplina"]
+MOTOR_DEFAULT = os.environ.get("CURSOS_MOTOR", "pandas")
+
+
+class MotorPandas:
+    nombre = "pandas"
+
+    def __init__(self, base):
+        self.d = derivar(base)
+        with etapa("cubo"):
+            self.cubo = construir_cubo(self.d)
+        with etapa("indice"):
+            self.indice = IndiceFiltros(self.d, FILTROS)
+
+    def filas(self, sel):
+        return self.indice.filas(**sel)
+
+    def seleccionar(self, *filtros):
+        """(posiciones de las filas, rebanada del cubo) con los mismos filtros."""
+        sel = dict(zip(FILTROS, filtros))
+        pos = self.filas(sel)
+        if len(self.d) <= np.iinfo(np.int32).max:
+            pos = pos.astype(np.int32)  # la mitad de memoria en las cachés de posiciones
+        # Rebanada del cubo con los mismos filtros: de aquí salen KPIs y gráficos
+        return pos, rebanar(self.cubo, **sel)
+
+    def tomar(self, pos):
+        """Filas de ``d`` en las posiciones ``pos`` (frame nuevo, índice 0..k)."""
+        return self.d.take(pos).reset_index(drop=True)
+
+    def filtrar(self, *filtros):
+        """(filas filtradas, rebanada del cubo) con los mismos filtros."""
+        pos, q = self.seleccionar(*filtros)
+        return self.tomar(pos), q
+
+
+class MotorDuckDB(MotorPandas):
+    nombre = "duckdb"
+
+    def __init__(self, base):
+        import duckdb
+
+        self.d = derivar(base)
+        # Solo dimensiones y medidas + posición de fila; DuckDB escanea el frame en sitio
+        self._t = self.d[DIMS + MEDIDAS].assign(_fila=np.arange(len(self.d)))
+        self._con = duckdb.connect()
+        with etapa("cubo"):
+            self.cubo = self._cubo()
+
+    def _consulta(self, sql, params=None, leer="df"):
+        # Cursor propio por llamada (las vistas registradas son por cursor; registrar no copia)
+        with self._con.cursor() as cur:
+            cur.register("d", self._t)
+            return getattr(cur.execute(sql, params), leer)()
+
+    def _cubo(self):
+        # Mismo resultado que construir_cubo: sumas por DIMS en orden de primera aparición
+        dims = ", ".join(f'"{c}"' for c in DIMS)
+        sumas = ", ".join(f'SUM("{c}") AS "{c}"' for c in MEDIDAS)
+        cubo = self._consulta(f"SELECT {dims}, {sumas} FROM d GROUP BY ALL ORDER BY MIN(_fila)")
+        # groupby().sum() conserva el dtype de cada columna (int32 suma a int32)
+        return cubo.astype(self.d[DIMS + MEDIDAS].dtypes.to_dict())
+
+    def filas(self, sel):
+        cond = " AND ".join(f'list_contains(?, CAST("{c}" AS VARCHAR))' for c in sel)
+        params = [[str(v) for v in valores] for valores in sel.values()]
+        res = self._consulta(f"SELECT _fila FROM d WHERE {cond} ORDER BY _fila", params, "fetchnumpy")
+        return np.asarray(res["_fila"], dtype=np.int64)
+
+
+MOTORES = {"pandas": MotorPandas, "duckdb": MotorDuckDB}
+
+
+def crear(base, nombre=None):
+    nombre = nombre or MOTOR_DEFAULT
+    if nombre not in MOTORES:
+        raise ValueError(f"Motor desconocido: {nombre} (opciones: {', '.join(MOTORES)})")
+    return MOTORES[nombre](base)
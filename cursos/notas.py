@@ -0,0 +1,91 @@
+# cursos/notas.py
+"""Notas del equipo persistidas en SQLite local.
+
+Una tabla ``notas`` con índices por (año, id), (programa, id) y (tag, id):
+el panel pide solo la página visible de las más recientes con sus filtros
+(``ORDER BY id DESC LIMIT``), así que el costo no crece con el historial.
+Cada operación abre su propia conexión, corta, y es segura entre los hilos
+de las sesiones de Streamlit.
+"""
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from cursos.almacen import RUTA_DEFAULT
+
+RUTA_NOTAS = Path(os.environ.get("CURSOS_NOTAS", RUTA_DEFAULT.parent / "notas.sqlite"))
+TAGS = ["riesgo", "idea", "tarea", "seguimiento", "dato"]
+COLUMNAS = ["ts", "año", "programa", "tag", "nota"]
+POR_PAGINA = 20
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS notas (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       TEXT NOT NULL,
+    anio     INTEGER,
+    programa TEXT NOT NULL,
+    tag      TEXT NOT NULL,
+    nota     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notas_anio ON notas (anio, id);
+CREATE INDEX IF NOT EXISTS notas_programa ON notas (programa, id);
+CREATE INDEX IF NOT EXISTS notas_tag ON notas (tag, id);
+"""
+
+
+def _donde(tags=None, programas=None, anios=None):
+    # WHERE + parámetros; None = sin filtro en esa columna
+    cond, params = [], []
+    for col, valores in (("tag", tags), ("programa", programas), ("anio", anios)):
+        if valores is not None:
+            valores = list(valores)
+            cond.append(f"{col} IN ({', '.join('?' * len(valores))})" if valores else "0")
+            params += valores
+    return (" WHERE " + " AND ".join(cond) if cond else ""), params
+
+
+class Notas:
+
+    def __init__(self, ruta=RUTA_NOTAS):
+        self.ruta = Path(ruta)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        with self._conexion() as con:
+            con.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conexion(self):
+        # ``with con`` confirma (o revierte) la transacción; closing libera el archivo
+        with closing(sqlite3.connect(self.ruta, timeout=10)) as con, con:
+            yield con
+
+    def agregar(self, nota, programa, tag, anio=None, ts=None):
+        ts = ts or datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self._conexion() as con:
+            cur = con.execute("INSERT INTO notas (ts, anio, programa, tag, nota) VALUES (?, ?, ?, ?, ?)",
+                              (ts, None if anio is None else int(anio), programa, tag, nota))
+        return cur.lastrowid
+
+    def contar(self, **filtros):
+        donde, params = _donde(**filtros)
+        with self._conexion() as con:
+            return con.execute(f"SELECT COUNT(*) FROM notas{donde}", params).fetchone()[0]
+
+    def recientes(self, n=POR_PAGINA, desde=0, **filtros):
+        """Hasta ``n`` notas (las más recientes primero, saltando ``desde``) como DataFrame de COLUMNAS."""
+        donde, params = _donde(**filtros)
+        with self._conexion() as con:
+            filas = con.execute(f"SELECT ts, anio, programa, tag, nota FROM notas{donde} "
+                                "ORDER BY id DESC LIMIT ? OFFSET ?", [*params, int(n), int(desde)]).fetchall()
+        return pd.DataFrame(filas, columns=COLUMNAS)
+
+    def programas(self):
+        with self._conexion() as con:
+            return [r[0] for r in con.execute("SELECT DISTINCT programa FROM notas ORDER BY programa")]
+
+    def frame(self, **filtros):
+        """Todas las notas que cumplen los filtros (para descargar)."""
+        return self.recientes(-1, **filtros)
@@ -0,0 +1,130 @@
+# cursos/perf.py
+"""Tiempos por etapa del dashboard.
+
+``etapa(nombre)`` (context manager) y ``medido(nombre)`` (decorador) miden
+tramos del pipeline y de cada pestaña. Cada medición va a un historial por
+proceso (últimas ``HISTORIAL`` por etapa, para p50/p95) y, si hay una corrida
+abierta en el hilo actual (``iniciar``/``cerrar``, una por recarga de la app),
+a los tiempos de esa corrida. Al cerrar, la corrida se emite como JSON por el
+logger ``cursos.perf`` y, si ``CURSOS_PERF_LOG`` apunta a un archivo, se
+agrega ahí como una línea JSON. ``cerrar`` también puede devolver el perfil
+``cProfile`` de la corrida si se pidió al iniciar.
+"""
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+HISTORIAL = 200
+LOG = os.environ.get("CURSOS_PERF_LOG")
+logger = logging.getLogger("cursos.perf")
+
+
+class Registro:
+    """Historial acotado de duraciones por etapa (seguro entre hilos)."""
+
+    def __init__(self, n=HISTORIAL):
+        self._hist = defaultdict(lambda: deque(maxlen=n))
+        self._lock = threading.Lock()
+
+    def anotar(self, nombre, seg):
+        with self._lock:
+            self._hist[nombre].append(seg)
+
+    def resumen(self):
+        """DataFrame etapa, n, último, p50, p95 (en ms), de la más lenta a la más rápida."""
+        with self._lock:
+            hist = {k: np.array(v) for k, v in self._hist.items()}
+        filas = [(k, len(v), v[-1] * 1e3, np.percentile(v, 50) * 1e3, np.percentile(v, 95) * 1e3)
+                 for k, v in hist.items()]
+        return (pd.DataFrame(filas, columns=["Etapa", "n", "Último ms", "p50 ms", "p95 ms"])
+                  .sort_values("p50 ms", ascending=False, ignore_index=True))
+
+    def limpiar(self):
+        with self._lock:
+            self._hist.clear()
+
+
+REGISTRO = Registro()
+# Tiempos de la corrida en curso (por hilo: Streamlit corre cada sesión en el suyo)
+_corrida = ContextVar("corrida", default=None)
+
+
+@contextmanager
+def etapa(nombre):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        seg = time.perf_counter() - t0
+        REGISTRO.anotar(nombre, seg)
+        tiempos = _corrida.get()
+        if tiempos is not None:
+            tiempos[nombre] = tiempos.get(nombre, 0.0) + seg
+
+
+def medido(nombre):
+    """Decorador: cada llamada a la función es una ``etapa(nombre)``."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def envuelta(*args, **kw):
+            with etapa(nombre):
+                return fn(*args, **kw)
+        return envuelta
+    return deco
+
+
+def iniciar(perfil=False):
+    """Abre una corrida en el hilo actual. Con ``perfil`` también arranca cProfile."""
+    prof = cProfile.Profile() if perfil else None
+    _corrida.set({})
+    if prof is not None:
+        try:
+            prof.enable()
+        except ValueError:
+            prof = None  # otro perfilador activo (p. ej. otra sesión perfilando)
+    return {"t0": time.perf_counter(), "prof": prof}
+
+
+def cerrar(token, top=30, **extra):
+    """Cierra la corrida abierta por ``iniciar``.
+
+    Devuelve ``(tiempos, perfil)``: segundos por etapa (incluye ``total``) y
+    el texto de pstats ordenado por tiempo acumulado, o None si no se perfiló.
+    Cerrar dos veces la misma corrida devuelve lo mismo sin volver a anotarla.
+    """
+    if "fin" in token:
+        return token["fin"]
+    tiempos = _corrida.get() or {}
+    _corrida.set(None)
+    tiempos["total"] = time.perf_counter() - token["t0"]
+    REGISTRO.anotar("total", tiempos["total"])
+
+    perfil = None
+    if token["prof"] is not None:
+        token["prof"].disable()
+        buf = io.StringIO()
+        pstats.Stats(token["prof"], stream=buf).sort_stats("cumulative").print_stats(top)
+        perfil = buf.getvalue()
+
+    registro = {"ts": datetime.now().isoformat(timespec="milliseconds"), **extra,
+                "ms": {k: round(v * 1e3, 3) for k, v in tiempos.items()}}
+    linea = json.dumps(registro, ensure_ascii=False, default=str)
+    logger.info(linea)
+    if LOG:
+        with open(LOG, "a", encoding="utf-8") as fh:
+            fh.write(linea + "\n")
+    token["fin"] = (tiempos, perfil)
+    return token["fin"]
@@ -0,0 +1,88 @@
+# cursos/pipeline.py
+"""Etapas del dashboard como funciones puras (sin Streamlit).
+
+    base --preparar--> motor --filtrar--> (f, q) --kpis / figuras / tabla_datos--> vista
+
+El motor (``cursos.motor``: pandas por defecto, DuckDB opcional) guarda la
+base derivada ``d`` y el cubo, y resuelve los filtros.
+
+Los filtros son siempre ``(anios, progs, canales, regiones, discs)``: tuplas
+de valores elegidos por columna (ver FILTROS).
+
+``app.py`` las envuelve con las cachés de Streamlit; ``cursos.bench`` las mide
+por separado.
+"""
+import pandas as pd
+
+from cursos import motor as motores
+from cursos.cubo import construir_cubo, totales, lider
+from cursos.derivados import derivar
+from cursos.motor import FILTROS
+from cursos.perf import medido
+
+
+@medido("preparar")
+def preparar(base, motor=None):
+    """Motor con base derivada + cubo (+ índice). Una vez por versión de datos."""
+    return motores.crear(base, motor)
+
+
+def aplicar_filtros(d, *filtros):
+    # Sin índice, con máscaras: para el delta de altas pendientes (pocas filas)
+    mask = pd.Series(True, index=d.index)
+    for col, valores in zip(FILTROS, filtros):
+        mask &= d[col].isin(valores)
+    return d[mask].reset_index(drop=True)
+
+
+@medido("filtrar")
+def filtrar(m, *filtros):
+    """(filas filtradas, rebanada del cubo) con los mismos filtros."""
+    return m.filtrar(*filtros)
+
+
+@medido("seleccionar")
+def seleccionar(m, *filtros):
+    """(posiciones, rebanada del cubo): lo cacheable de ``filtrar``, sin copiar filas."""
+    return m.seleccionar(*filtros)
+
+
+def sumar_delta(f, q, delta, *filtros):
+    """Suma altas pendientes (base sin derivar, pocas filas) a ``f`` y ``q``."""
+    fd = aplicar_filtros(derivar(delta), *filtros)
+    return pd.concat([f, fd], ignore_index=True), pd.concat([q, construir_cubo(fd)], ignore_index=True)
+
+
+@medido("kpis")
+def kpis(f, q):
+    tot = totales(q)
+    total_est = int(tot["Estudiantes"])
+    coloc_tot = int(tot["Colocados"])
+    return {
+        "filas": len(f),
+        "total_est": total_est,
+        "ingresos_tot": int(tot["IngresosMXN"]),
+        "ediciones": f["Edición"].nunique(),
+        "coloc_tot": coloc_tot,
+        "tasa_coloc": (coloc_tot / total_est * 100) if total_est > 0 else 0,
+        "top_prog": lider(q, "Programa"),
+        "top_region": lider(q, "Region"),
+        "top_canal": lider(q, "CanalDominante"),
+    }
+
+
+ORDEN_DATOS = ["MesNum","Programa"]
+
+
+def formato_datos(t):
+    """Ingresos enteros para mostrar/exportar (copia si hay que cambiar algo)."""
+    if "IngresosMXN" not in t:
+        return t
+    # IngresosMXN ya viene sin NaN/inf de ingresos_mxn
+    return t.assign(IngresosMXN=t["IngresosMXN"].round(0).astype("int64"))
+
+
+@medido("tabla_datos")
+def tabla_datos(f):
+    """Tabla de la pestaña Datos: ingresos enteros, orden por mes y programa."""
+    return formato_datos(f).sort_values(ORDEN_DATOS)
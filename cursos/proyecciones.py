@@ -0,0 +1,94 @@
+# cursos/proyecciones.py
+"""Proyecciones Monte Carlo del año siguiente por programa.
+
+Usa el mismo modelo que ``generador``: ediciones por programa ~ Poisson con la
+media histórica de la base, estudiantes por edición uniformes en ``RANGES``
+(× escala del año × factor de cohorte, mín. 5), colocados uniformes hasta
+``TASA_COLOC_MAX`` e ingresos = precio × unidades × estudiantes. Todos los
+escenarios se sortean juntos como matrices (escenarios × ediciones); si un
+programa tiene muchas ediciones esperadas se usa la aproximación normal de la
+suma, con media y covarianza exactas por edición.
+"""
+import numpy as np
+import pandas as pd
+
+from cursos.catalogos import PROGRAMAS
+from cursos.generador import RANGES, TASA_COLOC_MAX, YEAR_SCALE
+from cursos.ingresos import MESES_DEFAULT, SEMANAS_DEFAULT
+
+ESCENARIOS = 100_000
+CUANTILES = (10, 50, 90)
+MEDIDAS = ["Estudiantes", "IngresosMXN", "Colocados"]
+# Más ediciones que esto por escenario -> aproximación normal
+MAX_EXACTO = 32
+
+
+def ediciones_esperadas(base):
+    """Ediciones por año promedio de cada programa (los años sin el programa cuentan 0)."""
+    anios = max(1, base["Año"].nunique())
+    cuenta = base["Programa"].value_counts()
+    return {p[0]: float(cuenta.get(p[0], 0)) / anios for p in PROGRAMAS}
+
+
+def _por_estudiante(p):
+    # Ingreso por estudiante del catálogo (duración truncada, como ingresos_mxn)
+    _, _, unidad, precio, meses, semanas = p
+    unidades = int(meses or MESES_DEFAULT) if unidad == "MES" else int(semanas or SEMANAS_DEFAULT)
+    return precio * unidades
+
+
+def _cohorte(lo, hi, factor):
+    # Estudiantes y colocados por edición: un valor por sorteo posible de RANGES
+    est = np.maximum(5, np.floor(np.arange(lo, hi + 1) * factor)).astype(np.int64)
+    return est, np.maximum(1, (est * TASA_COLOC_MAX).astype(np.int64))
+
+
+def _exacto(rng, n_ed, k, lo, hi, factor):
+    u = rng.integers(0, hi - lo + 1, size=(len(n_ed), k))
+    est, tope = _cohorte(lo, hi, factor)
+    activa = np.arange(k) < n_ed[:, None]
+    e = est[u] * activa
+    c = rng.integers(0, tope[u]) * activa
+    return e.sum(axis=1), c.sum(axis=1)
+
+
+def _normal(rng, n_ed, lo, hi, factor):
+    est, tope = _cohorte(lo, hi, factor)
+    # Momentos exactos por edición: u uniforme; colocados | u uniforme en [0, tope)
+    m_e, m_c = est.mean(), ((tope - 1) / 2).mean()
+    v_e = est.var()
+    v_c = ((tope ** 2 - 1) / 12).mean() + ((tope - 1) / 2).var()
+    cov = ((est - m_e) * ((tope - 1) / 2 - m_c)).mean()
+    L = np.linalg.cholesky(np.array([[v_e, cov], [cov, v_c]]) + 1e-9 * np.eye(2))
+    z = rng.standard_normal((len(n_ed), 2)) @ L.T * np.sqrt(n_ed)[:, None]
+    e = np.maximum(0, np.round(n_ed * m_e + z[:, 0]))
+    c = np.clip(np.round(n_ed * m_c + z[:, 1]), 0, e)
+    return e, c
+
+
+def simular(esperadas, anio, escenarios=ESCENARIOS, precio=1.0, cohorte=1.0, semilla=42):
+    """Bandas P10/P50/P90 por programa (y ``Total``) para el año ``anio``.
+
+    ``esperadas`` es {programa: ediciones por año} (ver ``ediciones_esperadas``);
+    ``precio`` y ``cohorte`` multiplican el precio por unidad y el tamaño de
+    cada cohorte. Devuelve un DataFrame Programa, Medida, P10, P50, P90.
+    """
+    rng = np.random.default_rng(semilla)
+    factor = YEAR_SCALE.get(int(anio), 1.0) * cohorte
+    totales = np.zeros((len(MEDIDAS), escenarios))
+    filas = []
+    for p in PROGRAMAS:
+        lam = esperadas.get(p[0], 0.0)
+        if lam <= 0:
+            continue
+        lo, hi = RANGES[p[0]]
+        n_ed = rng.poisson(lam, size=escenarios)
+        k = int(np.ceil(lam + 6 * np.sqrt(lam) + 1))
+        e, c = _exacto(rng, n_ed, k, lo, hi, factor) if k <= MAX_EXACTO else _normal(rng, n_ed, lo, hi, factor)
+        sims = np.vstack([e, e * _por_estudiante(p) * precio, c])
+        totales += sims
+        for medida, q in zip(MEDIDAS, np.percentile(sims, CUANTILES, axis=1).T):
+            filas.append((p[0], medida, *q))
+    for medida, q in zip(MEDIDAS, np.percentile(totales, CUANTILES, axis=1).T):
+        filas.append(("Total", medida, *q))
+    return pd.DataFrame(filas, columns=["Programa", "Medida", *[f"P{c}" for c in CUANTILES]])
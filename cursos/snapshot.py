@@ -0,0 +1,156 @@
+# cursos/snapshot.py
+"""Snapshots precalculados para presentaciones (modo externo).
+
+Para cada año y combinación común de filtros (todo seleccionado, o un solo
+programa / canal / región / disciplina) se guardan los KPIs y todas las
+figuras, en las plantillas pedidas, como JSON::
+
+    snapshots/manifest.json          versión de la base + hash por año
+    snapshots/<año>/<clave>.json     {"filtros", "kpis", "figuras": {plantilla: {nombre: spec}}}
+
+Solo se recalculan los años cuyo contenido cambió. El manifiesto se escribe al
+final con la versión de la base; la app solo usa el snapshot si esa versión
+coincide con la que está mostrando.
+
+Uso::
+
+    python -m cursos.snapshot [--datos data/ediciones.parquet] [--salida data/snapshots] [--forzar]
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from cursos import figuras, pipeline
+from cursos.almacen import RUTA_DEFAULT, Almacen, version_de
+from cursos.catalogos import CANALES, REGIONES, DISCIP
+
+SNAP_DEFAULT = Path(os.environ.get("CURSOS_SNAPSHOTS", RUTA_DEFAULT.parent / "snapshots"))
+PLANTILLAS = ["Claro", "Oscuro"]
+FORMATO = 1
+
+
+def opciones(base):
+    """Valores por defecto de cada filtro de la barra lateral (ya ordenados)."""
+    return (tuple(sorted(base["Programa"].dropna().unique())), tuple(sorted(CANALES)),
+            tuple(sorted(REGIONES)), tuple(sorted(DISCIP)))
+
+
+def combinaciones(base, anio):
+    """Filtros comunes de ``anio``: todo seleccionado y cada valor suelto por columna."""
+    todos = opciones(base)
+    yield ((anio,), *todos)
+    for i, valores in enumerate(todos):
+        for v in valores:
+            yield ((anio,), *todos[:i], (v,), *todos[i + 1:])
+
+
+def clave(filtros):
+    txt = json.dumps([[str(v) for v in col] for col in filtros], ensure_ascii=False)
+    return hashlib.blake2b(txt.encode(), digest_size=10).hexdigest()
+
+
+def _hash_anio(base, anio):
+    sub = base[base["Año"] == anio].reset_index(drop=True)
+    extra = json.dumps([FORMATO, opciones(base)], ensure_ascii=False, default=str)
+    return hashlib.blake2b((version_de(sub) + extra).encode(), digest_size=12).hexdigest()
+
+
+def _escribir(ruta, obj):
+    tmp = ruta.with_suffix(ruta.suffix + ".tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False, default=str))
+    os.replace(tmp, ruta)
+
+
+def leer_manifiesto(salida=SNAP_DEFAULT):
+    ruta = Path(salida) / "manifest.json"
+    return json.loads(ruta.read_text()) if ruta.exists() else None
+
+
+def precalcular(base, salida=SNAP_DEFAULT, plantillas=PLANTILLAS, forzar=False, log=None):
+    """Recalcula los años cambiados. Devuelve ``{"recalculados": [...], "sin_cambio": [...]}``."""
+    salida = Path(salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    previo = leer_manifiesto(salida) or {}
+    mismo_formato = previo.get("formato") == FORMATO and previo.get("plantillas") == list(plantillas)
+    # Se invalida mientras se reescriben archivos: la app no lee snapshots a medias
+    _escribir(salida / "manifest.json", {**previo, "version": None})
+
+    m = pipeline.preparar(base)
+    anios = [int(a) for a in sorted(base["Año"].unique())]
+    hashes, hechos = {}, {"recalculados": [], "sin_cambio": []}
+    for anio in anios:
+        h = _hash_anio(base, anio)
+        hashes[str(anio)] = h
+        dir_anio = salida / str(anio)
+        if not forzar and mismo_formato and previo.get("anios", {}).get(str(anio)) == h and dir_anio.exists():
+            hechos["sin_cambio"].append(anio)
+            continue
+        t0 = time.perf_counter()
+        shutil.rmtree(dir_anio, ignore_errors=True)
+        dir_anio.mkdir(parents=True)
+        n = 0
+        for filtros in combinaciones(base, anio):
+            f, q = pipeline.filtrar(m, *filtros)
+            if f.empty:
+                continue
+            k = {c: (v.item() if hasattr(v, "item") else v) for c, v in pipeline.kpis(f, q).items()}
+            figs = {}
+            for p in plantillas:
+                tpl = figuras.px_template(p)
+                figs[tpl] = {nombre: fn(q, tpl).to_json(validate=False) for nombre, fn in figuras.FIGURAS.items()}
+            _escribir(dir_anio / f"{clave(filtros)}.json",
+                      {"filtros": [list(map(str, c)) for c in filtros], "kpis": k, "figuras": figs})
+            n += 1
+        hechos["recalculados"].append(anio)
+        if log:
+            print(f"{anio}: {n} combinaciones en {time.perf_counter() - t0:.1f}s", file=log, flush=True)
+
+    for sobra in salida.iterdir():
+        if sobra.is_dir() and sobra.name not in hashes:
+            shutil.rmtree(sobra)
+    _escribir(salida / "manifest.json", {"formato": FORMATO, "version": version_de(base),
+                                         "plantillas": list(plantillas), "anios": hashes})
+    return hechos
+
+
+def cargar(version, filtros, salida=SNAP_DEFAULT):
+    """Snapshot de ``filtros`` si existe y corresponde a la base ``version``; si no, None."""
+    salida = Path(salida)
+    man = leer_manifiesto(salida)
+    if not man or man.get("version") != version or len(filtros[0]) != 1:
+        return None
+    ruta = salida / str(filtros[0][0]) / f"{clave(filtros)}.json"
+    return json.loads(ruta.read_text()) if ruta.exists() else None
+
+
+def figura(spec):
+    """Figura Plotly desde el JSON guardado."""
+    import plotly.io as pio
+
+    return pio.from_json(spec, skip_invalid=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m cursos.snapshot", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--datos", default=str(RUTA_DEFAULT), help="Parquet de ediciones (default: %(default)s)")
+    ap.add_argument("--salida", default=str(SNAP_DEFAULT), help="directorio de snapshots (default: %(default)s)")
+    ap.add_argument("--plantillas", nargs="+", choices=PLANTILLAS, default=PLANTILLAS,
+                    help="apariencias de gráficos a precalcular (default: %(default)s)")
+    ap.add_argument("--forzar", action="store_true", help="recalcula todos los años")
+    args = ap.parse_args(argv)
+
+    from cursos.generador import seed_data
+
+    base = Almacen(args.datos, sembrar=seed_data).df
+    hechos = precalcular(base, args.salida, args.plantillas, args.forzar, log=sys.stdout)
+    print(f"Recalculados: {hechos['recalculados'] or '-'} · sin cambio: {hechos['sin_cambio'] or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())